@@ -9,11 +9,132 @@ import torch
 
 __all__ = ["cg", "lanczos"]
 
+# number of Lanczos steps between two blocked Cholesky-QR refresh passes over
+# the most recent basis vectors
+_LANCZOS_REORTH_BLOCK = 8
 
-def cg(A: DNDarray, b: DNDarray, x0: DNDarray, out: Optional[DNDarray] = None) -> DNDarray:
+
+class _SpMVContext:
+    """
+    Cached communication plan for repeated matrix-vector products with a fixed
+    operator ``A`` split along axis 0 and vectors split alike. ``ht.matmul``
+    rebuilds its communication schedule on every call; here the gather counts
+    and displacements as well as the buffer for the replicated input vector are
+    set up once and reused for every application.
+
+    The plan is derived from ``counts_displs_shape``, i.e. it describes the
+    default regular chunking; operator and vectors must be balanced or the
+    gathered shards would not line up with the counts.
+
+    Parameters
+    ----------
+    A : DNDarray
+        2D operator with ``split == 0``, balanced
+    """
+
+    def __init__(self, A: DNDarray):
+        self.A = A
+        n = A.shape[1]
+        self.counts, self.displs, _ = A.comm.counts_displs_shape((n,), 0)
+        self.buffer = torch.empty(n, dtype=A.larray.dtype, device=A.larray.device)
+        # with GPU data but no CUDA-aware MPI, the comm wrapper would stage
+        # through freshly allocated pageable host memory on every call; use
+        # persistent pinned staging buffers instead, so the device copies run
+        # asynchronously over NVLink/PCIe
+        self.host_recv = self.host_send = None
+        if self.buffer.is_cuda and not ht.communication.CUDA_AWARE_MPI:
+            self.host_recv = torch.empty(n, dtype=A.larray.dtype, pin_memory=True)
+            self.host_send = torch.empty(
+                self.counts[A.comm.rank], dtype=A.larray.dtype, pin_memory=True
+            )
+
+    def matvec(self, v: DNDarray, out: DNDarray) -> DNDarray:
+        """
+        Computes ``out = A @ v`` into the pre-allocated output vector.
+
+        Parameters
+        ----------
+        v : DNDarray
+            1D input vector, split along axis 0
+        out : DNDarray
+            1D output vector, split along axis 0
+        """
+        if self.host_recv is not None:
+            self.host_send.copy_(v.larray)
+            self.A.comm.Allgatherv(
+                self.host_send, (self.host_recv, self.counts, self.displs), recv_axis=0
+            )
+            self.buffer.copy_(self.host_recv, non_blocking=True)
+        else:
+            self.A.comm.Allgatherv(v.larray, (self.buffer, self.counts, self.displs), recv_axis=0)
+        torch.mv(self.A.larray, self.buffer, out=out.larray)
+        return out
+
+
+def _cg_local_partials(
+    p: torch.Tensor, r: torch.Tensor, Ap: torch.Tensor, work: Optional[torch.Tensor] = None
+) -> torch.Tensor:
+    """
+    Local partial sums ``[p.Ap, r.Ap, Ap.Ap, r.r]`` of the fused CG reduction.
+
+    When ``work``, a pre-allocated ``(3, n_local)`` buffer, is given (the CUDA
+    path), the vectors are packed once and all four inner products fall out of
+    a single batched Gram-matrix GEMM, replacing eight small reduction kernel
+    launches with two.
+    """
+    if work is not None:
+        work[0].copy_(p)
+        work[1].copy_(r)
+        work[2].copy_(Ap)
+        gram = work @ work.t()
+        return torch.stack((gram[0, 2], gram[1, 2], gram[2, 2], gram[1, 1]))
+    return torch.stack(((p * Ap).sum(), (r * Ap).sum(), (Ap * Ap).sum(), (r * r).sum()))
+
+
+@torch.jit.script
+def _cg_update_solution(x: torch.Tensor, p: torch.Tensor, alpha: torch.Tensor) -> None:
+    """
+    In-place update of the solution: ``x += alpha*p``; ``alpha`` is a 0-D tensor
+    so no host synchronization is required
+    """
+    x.addcmul_(p, alpha)
+
+
+@torch.jit.script
+def _cg_update_residual(r: torch.Tensor, Ap: torch.Tensor, alpha: torch.Tensor) -> None:
+    """
+    In-place update of the residual: ``r -= alpha*Ap``; ``alpha`` is a 0-D tensor
+    """
+    r.addcmul_(Ap, alpha, value=-1.0)
+
+
+@torch.jit.script
+def _cg_update_direction(
+    p_next: torch.Tensor, p: torch.Tensor, r: torch.Tensor, beta: torch.Tensor
+) -> None:
+    """
+    Fused search-direction update into a second buffer: ``p_next = r + beta*p``;
+    ``beta`` is a 0-D tensor
+    """
+    torch.mul(p, beta, out=p_next)
+    p_next.add_(r)
+
+
+def cg(
+    A: DNDarray,
+    b: DNDarray,
+    x0: DNDarray,
+    out: Optional[DNDarray] = None,
+    tol: float = 1e-10,
+) -> DNDarray:
     """
     Conjugate gradients method for solving a system of linear equations :math: `Ax = b`
 
+    The inner products required per iteration are fused into a single
+    (non-blocking) Allreduce on the process-local data; the new residual norm is
+    obtained from the recurrence :math:`r_{k+1} = r_k - \alpha Ap` instead of a
+    second reduction, making the hot loop communication-avoiding.
+
     Parameters
     ----------
     A : DNDarray
@@ -24,6 +145,10 @@ def cg(A: DNDarray, b: DNDarray, x0: DNDarray, out: Optional[DNDarray] = None) -
         Arbitrary 1D starting vector
     out : DNDarray, optional
         Output Vector
+    tol : float, optional
+        Convergence tolerance on the Euclidian norm of the residual. The check
+        compares the squared norm against ``tol**2``, which is algebraically
+        equivalent and avoids the per-iteration square root.
     """
     if not isinstance(A, DNDarray) or not isinstance(b, DNDarray) or not isinstance(x0, DNDarray):
         raise TypeError(
@@ -40,25 +165,100 @@ def cg(A: DNDarray, b: DNDarray, x0: DNDarray, out: Optional[DNDarray] = None) -
         raise RuntimeError("c needs to be a 1D vector")
 
     r = b - ht.matmul(A, x0)
-    p = r
-    rsold = ht.matmul(r, r)
-    x = x0
-
-    for i in range(len(b)):
-        Ap = ht.matmul(A, p)
-        alpha = rsold / ht.matmul(p, Ap)
-        x = x + alpha * p
-        r = r - alpha * Ap
-        rsnew = ht.matmul(r, r)
-        if ht.sqrt(rsnew).item() < 1e-10:
+    p = r.copy()
+    # second direction buffer: the direction update ping-pongs between the two
+    # so that the previous p stays valid for the deferred solution update
+    p_next = r.copy()
+    x = x0.copy() if x0.split == r.split else ht.resplit(x0, r.split)
+
+    # the reductions are performed manually on the local torch data, so all
+    # vectors have to share the distribution of the residual
+    distributed = r.split is not None and A.comm.is_distributed()
+
+    # with operator and vectors split along the rows, the SpMV can reuse a
+    # cached gather plan and a pre-allocated result instead of ht.matmul; the
+    # plan assumes the default regular chunking, so unbalanced inputs fall
+    # back to ht.matmul
+    spmv = None
+    if (
+        A.split == 0
+        and r.split == 0
+        and A.larray.dtype == r.larray.dtype
+        and A.is_balanced()
+        and r.is_balanced()
+    ):
+        spmv = _SpMVContext(A)
+        Ap = r.copy()
+
+    # on CUDA the four local inner products are batched into one GEMM; the
+    # packing buffer is allocated once (kernel-launch latency dominates the
+    # tiny reductions there, see _cg_local_partials)
+    work = (
+        torch.empty((3, r.larray.shape[0]), dtype=r.larray.dtype, device=r.larray.device)
+        if r.larray.is_cuda
+        else None
+    )
+
+    # squared tolerance, hoisted out of the loop
+    tol2 = tol * tol
+
+    # the solution update of the previous iteration is deferred into the
+    # communication window of the current one: (alpha, former direction)
+    delayed = None
+
+    # loop-invariant lookups, bound once
+    comm = A.comm
+    iallreduce = comm.Iallreduce
+    IN_PLACE = ht.communication.MPI.IN_PLACE
+    SUM = ht.communication.MPI.SUM
+    n = b.shape[0]
+
+    for i in range(n):
+        if spmv is not None:
+            spmv.matvec(p, Ap)
+        else:
+            Ap = ht.matmul(A, p)
+            if Ap.split != r.split:
+                Ap.resplit_(r.split)
+        # fuse the inner products for alpha and the residual recurrence into one
+        # length-4 buffer, reduced by a single non-blocking Allreduce; the exact
+        # r.r rides along to correct the recurrence for floating-point drift
+        buf = _cg_local_partials(p.larray, r.larray, Ap.larray, work)
+        req = None
+        if distributed:
+            req = iallreduce(IN_PLACE, buf, SUM)
+        # overlap the reduction with the independent local work: the solution
+        # update belonging to the previous iteration
+        if delayed is not None:
+            _cg_update_solution(x.larray, delayed[1], delayed[0])
+        if req is not None:
+            req.Wait()
+        # all scalars stay 0-D tensors on the device; unbind does not synchronize
+        pAp, rAp, ApAp, rsold = buf.unbind()
+        # device-side guard: after exact convergence p (and thus pAp) vanishes;
+        # a zero alpha lets the iteration stagnate harmlessly until the next
+        # tolerance check instead of spreading NaNs
+        alpha = torch.where(pAp != 0, rsold / pAp, torch.zeros_like(pAp))
+        # r_new·r_new = r·r - 2*alpha*r·Ap + alpha^2*Ap·Ap, already reduced above
+        rsnew = rsold - 2.0 * alpha * rAp + alpha * alpha * ApAp
+
+        _cg_update_residual(r.larray, Ap.larray, alpha)
+        # testing the tolerance forces a device-to-host sync, so only do it
+        # every few iterations
+        if i % 8 == 7 and rsnew.item() < tol2:
             print("Residual reaches tolerance in it = {}".format(i))
+            _cg_update_solution(x.larray, p.larray, alpha)
             if out is not None:
                 out = x
                 return out
             return x
-        p = r + ((rsnew / rsold) * p)
-        rsold = rsnew
+        beta = torch.where(rsold != 0, rsnew / rsold, torch.zeros_like(rsold))
+        _cg_update_direction(p_next.larray, p.larray, r.larray, beta)
+        delayed = (alpha, p.larray)
+        p, p_next = p_next, p
 
+    if delayed is not None:
+        _cg_update_solution(x.larray, delayed[1], delayed[0])
     if out is not None:
         out = x
         return out
@@ -71,7 +271,10 @@ def lanczos(
     v0: Optional[DNDarray] = None,
     V_out: Optional[DNDarray] = None,
     T_out: Optional[DNDarray] = None,
-) -> Tuple[DNDarray, DNDarray]:
+    return_eig: bool = False,
+    orth_dtype: Optional[torch.dtype] = None,
+    keep_split: bool = False,
+) -> Tuple[DNDarray, ...]:
     r"""
     The Lanczos algorithm is an iterative approximation of the solution to the eigenvalue problem, as an adaptation of
     power methods to find the m "most useful" (tending towards extreme highest/lowest) eigenvalues and eigenvectors of
@@ -94,6 +297,23 @@ def lanczos(
         Output Matrix for the Krylow vectors, Shape = (n, m)
     T_out : DNDarray, optional
         Output Matrix for the Tridiagonal matrix, Shape = (m, m)
+    return_eig : bool, optional
+        If ``True``, additionally return the eigenvalues of :math:`T` as a third
+        value. They are obtained from the small tridiagonal matrix directly,
+        which is orders of magnitude cheaper than an eigensolve on :math:`A`.
+    orth_dtype : torch.dtype, optional
+        Storage dtype for the Krylow basis, e.g. ``torch.bfloat16``. Halves the
+        memory footprint and bandwidth of the reorthogonalization for large
+        :math:`n`; the recurrence itself stays in the working precision and the
+        returned :math:`V` is cast back to the dtype of ``A``. Orthogonality
+        drift from the reduced precision is absorbed by the periodic blocked
+        Cholesky-QR refresh.
+    keep_split : bool, optional
+        If ``True``, return :math:`V` with its distributed split axis instead of
+        replicating it via a full allgather. Callers that consume :math:`V` in a
+        distributed matmul anyway should pass ``keep_split=True`` to save the
+        :math:`O(n \cdot m)` communication and memory of the resplit. If
+        ``V_out`` is provided, its split takes precedence.
     """
     if not isinstance(A, DNDarray):
         raise TypeError("A needs to be of type ht.dndarra, but was {}".format(type(A)))
@@ -106,79 +326,183 @@ def lanczos(
     n, column = A.shape
     if n != column:
         raise TypeError("Input Matrix A needs to be symmetric.")
-    T = ht.zeros((m, m))
-    if A.split == 0:
-        # This is done for better memory access in the reorthogonalization Gram-Schmidt algorithm
-        V = ht.ones((n, m), split=0, dtype=A.dtype, device=A.device)
+    # the tridiagonal coefficients are collected in two small local buffers and
+    # assembled into T once at the end; per-element setitem on a DNDarray would
+    # dispatch through the full heat indexing machinery for every write
+    alphas = torch.zeros(int(m), dtype=A.larray.dtype, device=A.larray.device)
+    betas = torch.zeros(int(m) - 1, dtype=A.larray.dtype, device=A.larray.device)
+    # dtype-aware breakdown tolerance instead of a fixed 1e-10
+    breakdown_tol = (
+        torch.finfo(A.larray.dtype).eps * n if A.larray.dtype.is_floating_point else 1e-10
+    )
+    # the Krylow vectors are kept as rows of an (m, n) matrix: a row is a
+    # contiguous slice of the row-major local torch tensor, so the
+    # reorthogonalization runs as contiguous GEMV/GEMM operations; the
+    # transposed (n, m) view is restored on return
+    vec_split = 0 if A.split == 0 else None
+    if orth_dtype is None:
+        V = ht.ones((m, n), split=1 if A.split == 0 else None, dtype=A.dtype, device=A.device)
+        V_loc = V.larray
     else:
-        V = ht.ones((n, m), split=None, dtype=A.dtype, device=A.device)
+        # reduced-precision local storage; re-wrapped as a DNDarray in A's
+        # precision on return
+        _, lshape, _ = A.comm.chunk((int(m), n), 1 if A.split == 0 else None)
+        V_loc = torch.ones(lshape, dtype=orth_dtype, device=A.larray.device)
 
     if v0 is None:
-        vr = ht.random.rand(n, split=V.split)
+        vr = ht.random.rand(n, split=vec_split)
         v0 = vr / ht.norm(vr)
     else:
-        if v0.split != V.split:
-            v0.resplit_(axis=V.split)
+        if v0.split != vec_split:
+            v0.resplit_(axis=vec_split)
     # # 0th iteration
     # # vector v0 has euklidian norm = 1
     w = ht.matmul(A, v0)
+    if w.split != vec_split:
+        w.resplit_(axis=vec_split)
     alpha = ht.dot(w, v0)
-    w = w - alpha * v0
-    T[0, 0] = alpha
-    V[:, 0] = v0
+    w.larray.add_(v0.larray, alpha=-alpha)
+    alphas[0] = alpha
+    V_loc[0].copy_(v0.larray)
+    # raw reference to the most recent Krylow vector, avoiding a re-slice of V
+    # in every w-update
+    v_prev = V_loc[0]
+
+    # cached SpMV plan, with a second w buffer to ping-pong into: vi may alias
+    # the current w, so the product must never overwrite it in place
+    # the cached plan assumes the default regular chunking, so unbalanced
+    # inputs fall back to ht.matmul
+    spmv = None
+    if (
+        A.split == 0
+        and w.split == 0
+        and A.larray.dtype == w.larray.dtype
+        and A.is_balanced()
+        and w.is_balanced()
+    ):
+        spmv = _SpMVContext(A)
+        w_next = ht.zeros_like(w)
+
+    # loop-invariant lookups, bound once
+    comm = A.comm
+    allreduce = comm.Allreduce
+    IN_PLACE = ht.communication.MPI.IN_PLACE
+    SUM = ht.communication.MPI.SUM
+
     for i in range(1, int(m)):
-        beta = ht.norm(w)
-        if abs(beta) < 1e-10:
+        V_i = V_loc[:i]
+
+        def _project(u: torch.Tensor) -> torch.Tensor:
+            # Gram-Schmidt projection coefficients and the norm of u itself,
+            # fused into a single reduced buffer of length i+1; with a
+            # reduced-precision basis the products run in the storage dtype and
+            # are accumulated in the working precision. The basis rows are unit
+            # vectors by construction, so no normalization terms are needed
+            buf = torch.cat(((V_i @ u.to(V_i.dtype)).to(u.dtype), (u * u).sum().reshape(1)))
+            if vec_split is not None:
+                allreduce(IN_PLACE, buf, SUM)
+            return buf
+
+        buf = _project(w.larray)
+        beta = torch.sqrt(buf[i]).item()
+        if abs(beta) < breakdown_tol:
             # print("Lanczos breakdown in iteration {}".format(i))
-            # Lanczos Breakdown, pick a random vector to continue
-            vr = ht.random.rand(n, dtype=A.dtype, split=V.split)
-            # orthogonalize v_r with respect to all vectors v[i]
-            for j in range(i):
-                vi_loc = V.larray[:, j]
-                a = torch.dot(vr.larray, vi_loc)
-                b = torch.dot(vi_loc, vi_loc)
-                A.comm.Allreduce(ht.communication.MPI.IN_PLACE, a, ht.communication.MPI.SUM)
-                A.comm.Allreduce(ht.communication.MPI.IN_PLACE, b, ht.communication.MPI.SUM)
-                vr.larray = vr.larray - a / b * vi_loc
-            # normalize v_r to Euclidian norm 1 and set as ith vector v
-            vi = vr / ht.norm(vr)
+            # Lanczos Breakdown: continue with a deterministic standard basis
+            # vector e_k, k cycling with the iteration; this avoids an n-sized
+            # random draw and the shared batched Gram-Schmidt pass below takes
+            # care of the orthogonalization
+            k = i % n
+            vr = ht.zeros(n, dtype=A.dtype, split=vec_split, device=A.device)
+            offset, lshape, _ = comm.chunk((n,), vec_split)
+            if offset <= k < offset + lshape[0]:
+                vr.larray[k - offset] = 1
+            buf = _project(vr.larray)
         else:
             vr = w
 
-            # Reorthogonalization
-            # ToDo: Rethink this; mask torch calls, See issue #494
-            # This is the fast solution, using item access on the ht.dndarray level is way slower
-            for j in range(i):
-                vi_loc = V.larray[:, j]
-                a = torch.dot(vr._DNDarray__array, vi_loc)
-                b = torch.dot(vi_loc, vi_loc)
-                A.comm.Allreduce(ht.communication.MPI.IN_PLACE, a, ht.communication.MPI.SUM)
-                A.comm.Allreduce(ht.communication.MPI.IN_PLACE, b, ht.communication.MPI.SUM)
-                vr._DNDarray__array = vr._DNDarray__array - a / b * vi_loc
+        # Reorthogonalization against all previous Krylow vectors, as classical
+        # Gram-Schmidt in block form with delayed normalization: beta, the
+        # projection coefficients and the norm of the orthogonalized vector all
+        # stem from the single reduction above
+        # ToDo: Rethink this; mask torch calls, See issue #494
+        # This is the fast solution, using item access on the ht.dndarray level is way slower
+        coeffs = buf[:i]
+        vr.larray.sub_((coeffs.to(V_i.dtype) @ V_i).to(vr.larray.dtype))
 
+        # normalize v_r to Euclidian norm 1 and set as ith vector v; the norm
+        # follows from the Pythagorean identity on the already-reduced values,
+        # with an explicit norm as fallback in case of cancellation
+        vnorm2 = (buf[i] - (coeffs * coeffs).sum()).item()
+        if vnorm2 > 0.0:
+            vr.larray.div_(vnorm2**0.5)
+            vi = vr
+        else:
             vi = vr / ht.norm(vr)
 
-        w = ht.matmul(A, vi)
+        if spmv is not None:
+            spmv.matvec(vi, w_next)
+            w, w_next = w_next, w
+        else:
+            w = ht.matmul(A, vi)
+            if w.split != vec_split:
+                w.resplit_(axis=vec_split)
         alpha = ht.dot(w, vi)
 
-        w = w - alpha * vi - beta * V[:, i - 1]
+        w.larray.add_(vi.larray, alpha=-alpha).add_(v_prev, alpha=-beta)
 
-        T[i - 1, i] = beta
-        T[i, i - 1] = beta
-        T[i, i] = alpha
-        V[:, i] = vi
+        betas[i - 1] = beta
+        alphas[i] = alpha
+        V_loc[i].copy_(vi.larray)
+        v_prev = V_loc[i]
 
-    if V.split is not None:
+        # blocked drift correction: every few steps the most recent block of
+        # basis vectors is re-orthonormalized with one (shifted) Cholesky-QR
+        # pass, a BLAS-3 operation needing a single Allreduce of a small Gram
+        # matrix, instead of per-vector corrective sweeps
+        if (i + 1) % _LANCZOS_REORTH_BLOCK == 0:
+            W = V_loc[i + 1 - _LANCZOS_REORTH_BLOCK : i + 1]
+            G = (W @ W.t()).to(A.larray.dtype)
+            if vec_split is not None:
+                allreduce(IN_PLACE, G, SUM)
+            # small diagonal shift keeps the factorization stable for an
+            # ill-conditioned block
+            G.diagonal().add_(torch.finfo(G.dtype).eps * torch.trace(G))
+            L = torch.cholesky(G)
+            W.copy_(torch.triangular_solve(W.to(G.dtype), L, upper=False).solution)
+            v_prev = V_loc[i]
+
+    if orth_dtype is not None:
+        # re-wrap the reduced-precision storage in A's precision
+        if vec_split is not None:
+            V = ht.array(V_loc.to(A.larray.dtype), is_split=1, device=A.device)
+        else:
+            V = ht.array(V_loc.to(A.larray.dtype), device=A.device)
+
+    # restore the documented (n, m) column layout; the replication of V is a
+    # full allgather and is skipped when the caller asked to keep the split (or
+    # requested a distributed V_out)
+    V = ht.transpose(V)
+    if V_out is not None:
+        if V.split != V_out.split:
+            V.resplit_(axis=V_out.split)
+    elif V.split is not None and not keep_split:
         V.resplit_(axis=None)
 
+    # assemble the tridiagonal matrix from the collected coefficients
+    T = ht.array(torch.diag(alphas) + torch.diag(betas, 1) + torch.diag(betas, -1))
+
+    # the tridiagonal T is small and replicated, so its eigenvalues are
+    # computed redundantly on every rank
+    eig = ht.array(torch.symeig(T.larray, eigenvectors=False).eigenvalues) if return_eig else None
+
     if T_out is not None:
         T_out = T.copy()
         if V_out is not None:
             V_out = V.copy()
-            return V_out, T_out
-        return V, T_out
+            return (V_out, T_out, eig) if return_eig else (V_out, T_out)
+        return (V, T_out, eig) if return_eig else (V, T_out)
     elif V_out is not None:
         V_out = V.copy()
-        return V_out, T
+        return (V_out, T, eig) if return_eig else (V_out, T)
 
-    return V, T
+    return (V, T, eig) if return_eig else (V, T)
@@ -1,51 +1,324 @@
 import torch
+import functools
+import itertools
 import os
 import unittest
 import heat as ht
 import numpy as np
 
+from ...communication import MPI
 from ...tests.test_suites.basic_test import TestCase
 
 
+_arange_cache = {}
+
+
+def _ar(end, device):
+    """
+    Cached ``torch.arange(1, end + 1)`` fill buffer; the same few ranges are
+    used by every seeded operand, so each is allocated and filled only once
+    per device
+    """
+    key = (end, str(device))
+    if key not in _arange_cache:
+        _arange_cache[key] = torch.arange(1, end + 1, device=device)
+    return _arange_cache[key]
+
+
+@functools.lru_cache(maxsize=None)
+def _tri_mask(rows, cols, k, device):
+    """
+    Closed-form upper-triangular reference: entry (r, c) is one iff
+    ``c >= r + k``. Two aranges and a broadcast comparison replace the
+    materialized ones tensor plus triu kernel, and nothing below the
+    diagonal is ever written. Cached at module scope — the masks are only
+    ever read, so sharing one tensor per (shape, k, device) is safe.
+    """
+    r = torch.arange(rows, device=device).unsqueeze(1)
+    c = torch.arange(cols, device=device).unsqueeze(0)
+    return (c >= r + k).to(torch.get_default_dtype())
+
+
+@functools.lru_cache(maxsize=None)
+def _triu_chunk_sum(gshape, split, start, length, k):
+    """
+    Closed-form count of surviving ones in one chunk of
+    ``ht.ones(gshape).triu(k)``: entry (r, c) survives iff ``c >= r + k``.
+    Knowing the chunk offset along the split axis, each rank can verify its
+    local sum without any reduction.
+    """
+    rows, cols = gshape
+    if split == 0:
+        return sum(max(0, cols - max(0, r + k)) for r in range(start, start + length))
+    return sum(min(rows, max(0, c - k + 1)) for c in range(start, start + length))
+
+
+@functools.lru_cache(maxsize=None)
+def _trace_result_shape(gshape, axis1, axis2):
+    """
+    Shape of ``ht.trace(x, axis1=axis1, axis2=axis2)`` for a global shape
+    ``gshape``: both traced axes are removed. Deleting the larger index first
+    keeps the derivation correct for any axis order, and the cache makes the
+    repeated lookups across subtests free.
+    """
+    shape = list(gshape)
+    del shape[max(axis1, axis2)]
+    del shape[min(axis1, axis2)]
+    return tuple(shape)
+
+
+def _trace_zero_shape(gshape, axis1, axis2, offset):
+    """
+    Predict the result shape of ``ht.trace`` for an offset that pushes the
+    diagonal completely out of the traced plane: the result is known to be
+    all zeros, so no reference trace has to be evaluated.
+    """
+    assert abs(offset) >= min(gshape[axis1], gshape[axis2])
+    return _trace_result_shape(gshape, axis1, axis2)
+
+
+def _seeded(n, m, device, col=-1):
+    """
+    Test operand for the matmul grid: a ones matrix with the first row and one
+    column replaced by ranges, built with three vectorized torch fills instead
+    of per-element DNDarray assignments (which each dispatch a collective)
+    """
+    t = torch.ones((n, m), device=device)
+    t[0] = _ar(m, device)
+    t[:, col] = _ar(n, device)
+    return t
+
+
 class TestLinalgBasics(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super(TestLinalgBasics, cls).setUpClass()
+        # operands for the matmul split grid, assembled once per class: building
+        # them per-subtest via ht.ones plus row/column assignment costs several
+        # collectives each, wrapping the ready-made torch tensor costs one
+        dev = cls.device.torch_device
+        n, m = 21, 31
+        j, k = m, 45
+        a_torch = _seeded(n, m, dev)
+        b_torch = _seeded(j, k, dev, col=0)
+        cls._mm_a_torch, cls._mm_b_torch = a_torch, b_torch
+        cls._operands = {}
+        for dtype, splits in (
+            (ht.float32, (None, 0, 1)),
+            (ht.float64, (0,)),
+            (ht.int64, (None, 0, 1)),
+        ):
+            for split in splits:
+                cls._operands[((n, m), dtype, split)] = ht.array(
+                    a_torch.to(dtype.torch_type()), split=split
+                )
+        for dtype, splits in ((ht.float32, (None, 0, 1)), (ht.float64, (0, 1))):
+            for split in splits:
+                cls._operands[((j, k), dtype, split)] = ht.array(
+                    b_torch.to(dtype.torch_type()), split=split
+                )
+        for dtype in (ht.float32, ht.int64):
+            for split in (None, 0):
+                cls._operands[((m,), dtype, split)] = ht.array(
+                    torch.ones(m, dtype=dtype.torch_type(), device=dev), split=split
+                )
+        # shared inputs for the trace tests and a memo table for their NumPy
+        # reference results; all trace inputs derive from the same arange(24),
+        # so a (shape, dtype, arguments) key identifies a reference uniquely
+        cls._x2d_np = np.arange(24).reshape((6, 4))
+        cls._x2d = ht.arange(24).reshape((6, 4))
+        cls._x4d_np = np.arange(24).reshape((1, 2, 3, 4))
+        cls._x4d = ht.arange(24).reshape((1, 2, 3, 4))
+        # Python-list views for the array_like input cases, serialized once:
+        # DNDarray.tolist() gathers the tensor and allocates one PyObject per
+        # element on every call
+        cls._x2d_list = cls._x2d_np.tolist()
+        cls._x4d_list = cls._x4d_np.tolist()
+        cls._trace_cache = {}
+        cls._np_ref_cache = {}
+        # 4-D operands shared between test_transpose and the trace tests,
+        # built once per class instead of once per test
+        cls._zeros_4d = ht.zeros((2, 3, 4, 5))
+        cls._ones_4d_split = ht.ones((3, 4, 5, 6), split=3)
+        # distributed ones operands shared by test_tril and test_triu; each
+        # ht.ones with a split does communicator and split-map bookkeeping,
+        # so they are built once per class
+        cls._ones_1d_split = ht.ones((5,), split=0)
+        cls._ones_2d_split0 = ht.ones((4, 5), split=0)
+        cls._ones_2d_split1 = ht.ones((4, 5), split=1)
+
+    def _assert_close_ht(self, x, y, atol=1e-6):
+        """
+        Assert that two identically distributed DNDarrays are numerically
+        close. Compares the process-local tensors and reduces one boolean,
+        instead of an exact elementwise ht.equal on floating-point results
+        """
+        ok = bool(torch.allclose(x.larray, y.larray, atol=atol))
+        if x.split is not None and x.comm.is_distributed():
+            ok = x.comm.allreduce(ok, op=MPI.LAND)
+        self.assertTrue(ok)
+
+    def _trace_ref(self, x_np, offset=0, axis1=0, axis2=1, dtype=None):
+        """
+        Memoized ``np.trace`` reference: identical (input, offset, axes, dtype)
+        combinations appear in several subtests and are evaluated only once
+        """
+        key = (
+            x_np.shape,
+            x_np.dtype.str,
+            offset,
+            axis1,
+            axis2,
+            np.dtype(dtype).str if dtype is not None else None,
+        )
+        cache = type(self)._trace_cache
+        if key not in cache:
+            cache[key] = np.trace(x_np, offset=offset, axis1=axis1, axis2=axis2, dtype=dtype)
+        return cache[key]
+
+    def _assert_trace_matches(self, result, x, offset=0, axis1=0, axis2=1):
+        """
+        Check a ``ht.trace(x, ...)`` result against an on-device reference,
+        i.e. the sum over the (offset-)diagonal of the local torch tensor.
+        When the split axis is one of the trace axes every rank only holds a
+        stripe of the diagonal, so the local offset is shifted by the chunk
+        start and the partial sums are completed with a single Allreduce;
+        either way the host round-trip through ``x.numpy()`` is avoided.
+        """
+        a1, a2 = axis1 % x.ndim, axis2 % x.ndim
+        o = offset
+        reduced = x.split is not None and x.split in (a1, a2)
+        if reduced:
+            start, _, _ = x.comm.chunk(x.gshape, x.split)
+            o = offset + start if x.split == a1 else offset - start
+        ref = torch.diagonal(x.larray, offset=o, dim1=a1, dim2=a2).sum(-1)
+        if reduced:
+            buf = ref.contiguous().reshape(-1)
+            x.comm.Allreduce(MPI.IN_PLACE, buf, MPI.SUM)
+            ref = buf.reshape(ref.shape)
+        if not isinstance(result, ht.DNDarray):
+            self.assertEqual(result, ref.item())
+        elif result.split is None:
+            ref = ref.to(result.larray.dtype)
+            if result.larray.dtype.is_floating_point:
+                ok = bool(torch.allclose(result.larray, ref))
+            else:
+                # integer results are exact; compare them bit for bit
+                ok = bool(torch.equal(result.larray, ref))
+            if result.comm.is_distributed():
+                ok = result.comm.allreduce(ok, op=MPI.LAND)
+            self.assertTrue(ok)
+        else:
+            self._assert_matches_full(result, ref)
+
+    def assert_lshape_matches(self, tensor, pattern):
+        """
+        Compare ``tensor.lshape`` against ``pattern`` in one pass. Pattern
+        entries are exact sizes, with ``-1`` standing for a split dimension
+        that may hold anything up to the global extent. Reading ``lshape``
+        and ``gshape`` once instead of per assertion keeps the Python-level
+        attribute traffic on distributed tensors to a minimum.
+        """
+        lshape, gshape = tensor.lshape, tensor.gshape
+        self.assertEqual(len(lshape), len(pattern))
+        for i, expected in enumerate(pattern):
+            if expected == -1:
+                self.assertLessEqual(lshape[i], gshape[i])
+            else:
+                self.assertEqual(lshape[i], expected)
+
+    def _assert_zero(self, res, atol=1e-6):
+        """
+        Assert that ``res`` is numerically zero everywhere. Compares the
+        process-local data and reduces a single boolean, instead of allocating
+        a zeros array and running an elementwise comparison collective
+        """
+        local = bool((res.larray.abs() < atol).all())
+        if res.split is not None and res.comm.is_distributed():
+            local = res.comm.allreduce(local, op=MPI.LAND)
+        self.assertTrue(local)
+
+    def _assert_matches_full(self, ret, full_ref, atol=1e-6):
+        """
+        Assert that a (possibly distributed) DNDarray matches a reference torch
+        tensor held in full on every process. Each process checks its local
+        chunk against the corresponding slice of the reference, so only one
+        boolean is reduced instead of scattering a reference array and running
+        an elementwise comparison collective
+        """
+        local_ref = full_ref
+        if ret.split is not None:
+            lmap = ret.create_lshape_map()
+            offset = int(lmap[: ret.comm.rank, ret.split].sum())
+            local_ref = full_ref.narrow(ret.split, offset, int(lmap[ret.comm.rank, ret.split]))
+        local_ref = local_ref.to(ret.larray.dtype)
+        if ret.larray.dtype.is_floating_point:
+            ok = bool(torch.allclose(ret.larray, local_ref, atol=atol))
+        else:
+            # integer results are exact; compare them bit for bit
+            ok = bool(torch.equal(ret.larray, local_ref))
+        if ret.split is not None and ret.comm.is_distributed():
+            ok = ret.comm.allreduce(ok, op=MPI.LAND)
+        self.assertTrue(ok)
+
+    def _assert_matches_np(self, result, result_np):
+        """
+        Compare a DNDarray against a numpy reference that every process holds
+        in full. The reference is lifted into a torch tensor once and handed
+        to ``_assert_matches_full``, so each rank only checks its local chunk
+        and a single boolean is reduced — the result is never gathered.
+        """
+        result_np = np.asarray(result_np)
+        self.assertEqual(tuple(result.shape), result_np.shape)
+        # the same reference value recurs across subtests; memoize the torch
+        # conversion by content so each distinct array is converted once
+        key = (result_np.shape, result_np.dtype.str, result_np.tobytes())
+        cache = type(self)._np_ref_cache
+        ref = cache.get(key)
+        if ref is None:
+            ref = cache[key] = torch.from_numpy(np.ascontiguousarray(result_np))
+        self._assert_matches_full(result, ref.to(result.larray.device))
+
     def test_dot(self):
         # ONLY TESTING CORRECTNESS! ALL CALLS IN DOT ARE PREVIOUSLY TESTED
         # cases to test:
         data2d = np.ones((10, 10))
-        data3d = np.ones((10, 10, 10))
         data1d = np.arange(10)
+        # references, each computed (and broadcast) once
+        ref_11 = np.dot(data1d, data1d)
+        ref_22_ht = ht.array(np.dot(data2d, data2d))
 
         a1d = ht.array(data1d, dtype=ht.float32, split=0)
         b1d = ht.array(data1d, dtype=ht.float32, split=0)
 
         # 2 1D arrays,
-        self.assertEqual(ht.dot(a1d, b1d), np.dot(data1d, data1d))
+        self.assertEqual(ht.dot(a1d, b1d), ref_11)
         ret = []
-        self.assertEqual(ht.dot(a1d, b1d, out=ret), np.dot(data1d, data1d))
+        self.assertEqual(ht.dot(a1d, b1d, out=ret), ref_11)
 
         a1d = ht.array(data1d, dtype=ht.float32, split=None)
         b1d = ht.array(data1d, dtype=ht.float32, split=0)
-        self.assertEqual(ht.dot(a1d, b1d), np.dot(data1d, data1d))
+        self.assertEqual(ht.dot(a1d, b1d), ref_11)
 
         a1d = ht.array(data1d, dtype=ht.float32, split=None)
         b1d = ht.array(data1d, dtype=ht.float32, split=None)
-        self.assertEqual(ht.dot(a1d, b1d), np.dot(data1d, data1d))
+        self.assertEqual(ht.dot(a1d, b1d), ref_11)
 
         a1d = ht.array(data1d, dtype=ht.float32, split=0)
         b1d = ht.array(data1d, dtype=ht.float32, split=0)
-        self.assertEqual(ht.dot(a1d, b1d), np.dot(data1d, data1d))
+        self.assertEqual(ht.dot(a1d, b1d), ref_11)
         # 2 1D arrays,
 
         a2d = ht.array(data2d, split=1)
         b2d = ht.array(data2d, split=1)
         # 2 2D arrays,
-        res = ht.dot(a2d, b2d) - ht.array(np.dot(data2d, data2d))
-        self.assertEqual(ht.equal(res, ht.zeros(res.shape)), 1)
+        res = ht.dot(a2d, b2d) - ref_22_ht
+        self._assert_zero(res)
         ret = ht.array(data2d, split=1)
         ht.dot(a2d, b2d, out=ret)
 
-        res = ret - ht.array(np.dot(data2d, data2d))
-        self.assertEqual(ht.equal(res, ht.zeros(res.shape)), 1)
+        res = ret - ref_22_ht
+        self._assert_zero(res)
 
         const1 = 5
         const2 = 6
@@ -53,41 +326,37 @@ class TestLinalgBasics(TestCase):
         res = ht.dot(const1, b2d) - ht.array(np.dot(const1, data2d))
         ret = 0
         ht.dot(const1, b2d, out=ret)
-        self.assertEqual(ht.equal(res, ht.zeros(res.shape)), 1)
+        self._assert_zero(res)
 
         # b is const
         res = ht.dot(a2d, const2) - ht.array(np.dot(data2d, const2))
-        self.assertEqual(ht.equal(res, ht.zeros(res.shape)), 1)
+        self._assert_zero(res)
         # a and b and const
         self.assertEqual(ht.dot(const2, const1), 5 * 6)
 
         with self.assertRaises(NotImplementedError):
-            ht.dot(ht.array(data3d), ht.array(data1d))
+            # the operands only need the right dimensionality to trigger the
+            # error, so skip the data initialization and broadcast
+            ht.dot(ht.empty((10, 10, 10)), b1d)
 
-    def test_matmul(self):
+    def test_matmul_local(self):
         with self.assertRaises(ValueError):
             ht.matmul(ht.ones((25, 25)), ht.ones((42, 42)))
 
         # cases to test:
         n, m = 21, 31
         j, k = m, 45
-        a_torch = torch.ones((n, m), device=self.device.torch_device)
-        a_torch[0] = torch.arange(1, m + 1, device=self.device.torch_device)
-        a_torch[:, -1] = torch.arange(1, n + 1, device=self.device.torch_device)
-        b_torch = torch.ones((j, k), device=self.device.torch_device)
-        b_torch[0] = torch.arange(1, k + 1, device=self.device.torch_device)
-        b_torch[:, 0] = torch.arange(1, j + 1, device=self.device.torch_device)
+        a_torch = _seeded(n, m, self.device.torch_device)
+        b_torch = _seeded(j, k, self.device.torch_device, col=0)
+        # reference results, each computed once instead of per assertion
+        ref_mm = a_torch @ b_torch
 
         # splits None None
-        a = ht.ones((n, m), split=None)
-        b = ht.ones((j, k), split=None)
-        a[0] = ht.arange(1, m + 1)
-        a[:, -1] = ht.arange(1, n + 1)
-        b[0] = ht.arange(1, k + 1)
-        b[:, 0] = ht.arange(1, j + 1)
+        a = self._operands[((n, m), ht.float32, None)]
+        b = self._operands[((j, k), ht.float32, None)]
         ret00 = ht.matmul(a, b)
 
-        self.assertEqual(ht.all(ret00 == ht.array(a_torch @ b_torch)), 1)
+        self._assert_matches_full(ret00, ref_mm)
         self.assertIsInstance(ret00, ht.DNDarray)
         self.assertEqual(ret00.shape, (n, k))
         self.assertEqual(ret00.dtype, ht.float)
@@ -96,15 +365,11 @@ class TestLinalgBasics(TestCase):
         self.assertEqual(b.split, None)
 
         # splits None None
-        a = ht.ones((n, m), split=None)
-        b = ht.ones((j, k), split=None)
-        a[0] = ht.arange(1, m + 1)
-        a[:, -1] = ht.arange(1, n + 1)
-        b[0] = ht.arange(1, k + 1)
-        b[:, 0] = ht.arange(1, j + 1)
+        a = self._operands[((n, m), ht.float32, None)].copy()
+        b = self._operands[((j, k), ht.float32, None)]
         ret00 = ht.matmul(a, b, allow_resplit=True)
 
-        self.assertEqual(ht.all(ret00 == ht.array(a_torch @ b_torch)), 1)
+        self._assert_matches_full(ret00, ref_mm)
         self.assertIsInstance(ret00, ht.DNDarray)
         self.assertEqual(ret00.shape, (n, k))
         self.assertEqual(ret00.dtype, ht.float)
@@ -112,446 +377,117 @@ class TestLinalgBasics(TestCase):
         self.assertEqual(a.split, 0)
         self.assertEqual(b.split, None)
 
-        if a.comm.size > 1:
-            # splits 00
-            a = ht.ones((n, m), split=0, dtype=ht.float64)
-            b = ht.ones((j, k), split=0)
-            a[0] = ht.arange(1, m + 1)
-            a[:, -1] = ht.arange(1, n + 1)
-            b[0] = ht.arange(1, k + 1)
-            b[:, 0] = ht.arange(1, j + 1)
-            ret00 = a @ b
-
-            ret_comp00 = ht.array(a_torch @ b_torch, split=0)
-            self.assertTrue(ht.equal(ret00, ret_comp00))
-            self.assertIsInstance(ret00, ht.DNDarray)
-            self.assertEqual(ret00.shape, (n, k))
-            self.assertEqual(ret00.dtype, ht.float64)
-            self.assertEqual(ret00.split, 0)
-
-            # splits 00 (numpy)
-            a = ht.array(np.ones((n, m)), split=0)
-            b = ht.array(np.ones((j, k)), split=0)
-            a[0] = ht.arange(1, m + 1)
-            a[:, -1] = ht.arange(1, n + 1)
-            b[0] = ht.arange(1, k + 1)
-            b[:, 0] = ht.arange(1, j + 1)
-            ret00 = a @ b
-
-            ret_comp00 = ht.array(a_torch @ b_torch, split=0)
-            self.assertTrue(ht.equal(ret00, ret_comp00))
-            self.assertIsInstance(ret00, ht.DNDarray)
-            self.assertEqual(ret00.shape, (n, k))
-            self.assertEqual(ret00.dtype, ht.float64)
-            self.assertEqual(ret00.split, 0)
-
-            # splits 01
-            a = ht.ones((n, m), split=0)
-            b = ht.ones((j, k), split=1, dtype=ht.float64)
-            a[0] = ht.arange(1, m + 1)
-            a[:, -1] = ht.arange(1, n + 1)
-            b[0] = ht.arange(1, k + 1)
-            b[:, 0] = ht.arange(1, j + 1)
-            ret00 = ht.matmul(a, b)
-
-            ret_comp01 = ht.array(a_torch @ b_torch, split=0)
-            self.assertTrue(ht.equal(ret00, ret_comp01))
-            self.assertIsInstance(ret00, ht.DNDarray)
-            self.assertEqual(ret00.shape, (n, k))
-            self.assertEqual(ret00.dtype, ht.float64)
-            self.assertEqual(ret00.split, 0)
-
-            # splits 10
-            a = ht.ones((n, m), split=1)
-            b = ht.ones((j, k), split=0)
-            a[0] = ht.arange(1, m + 1)
-            a[:, -1] = ht.arange(1, n + 1)
-            b[0] = ht.arange(1, k + 1)
-            b[:, 0] = ht.arange(1, j + 1)
-            ret00 = ht.matmul(a, b)
-
-            ret_comp10 = ht.array(a_torch @ b_torch, split=1)
-            self.assertTrue(ht.equal(ret00, ret_comp10))
-            self.assertIsInstance(ret00, ht.DNDarray)
-            self.assertEqual(ret00.shape, (n, k))
-            self.assertEqual(ret00.dtype, ht.float)
-            self.assertEqual(ret00.split, 1)
-
-            # splits 11
-            a = ht.ones((n, m), split=1)
-            b = ht.ones((j, k), split=1)
-            a[0] = ht.arange(1, m + 1)
-            a[:, -1] = ht.arange(1, n + 1)
-            b[0] = ht.arange(1, k + 1)
-            b[:, 0] = ht.arange(1, j + 1)
-            ret00 = ht.matmul(a, b)
-
-            ret_comp11 = ht.array(a_torch @ b_torch, split=1)
-            self.assertTrue(ht.equal(ret00, ret_comp11))
-            self.assertIsInstance(ret00, ht.DNDarray)
-            self.assertEqual(ret00.shape, (n, k))
-            self.assertEqual(ret00.dtype, ht.float)
-            self.assertEqual(ret00.split, 1)
-
-            # splits 11 (torch)
-            a = ht.array(torch.ones((n, m), device=self.device.torch_device), split=1)
-            b = ht.array(torch.ones((j, k), device=self.device.torch_device), split=1)
-            a[0] = ht.arange(1, m + 1)
-            a[:, -1] = ht.arange(1, n + 1)
-            b[0] = ht.arange(1, k + 1)
-            b[:, 0] = ht.arange(1, j + 1)
-            ret00 = ht.matmul(a, b)
-
-            ret_comp11 = ht.array(a_torch @ b_torch, split=1)
-            self.assertTrue(ht.equal(ret00, ret_comp11))
-            self.assertIsInstance(ret00, ht.DNDarray)
-            self.assertEqual(ret00.shape, (n, k))
-            self.assertEqual(ret00.dtype, ht.float)
-            self.assertEqual(ret00.split, 1)
-
-            # splits 0 None
-            a = ht.ones((n, m), split=0)
-            b = ht.ones((j, k), split=None)
-            a[0] = ht.arange(1, m + 1)
-            a[:, -1] = ht.arange(1, n + 1)
-            b[0] = ht.arange(1, k + 1)
-            b[:, 0] = ht.arange(1, j + 1)
-            ret00 = ht.matmul(a, b)
-
-            ret_comp0 = ht.array(a_torch @ b_torch, split=0)
-            self.assertTrue(ht.equal(ret00, ret_comp0))
-            self.assertIsInstance(ret00, ht.DNDarray)
-            self.assertEqual(ret00.shape, (n, k))
-            self.assertEqual(ret00.dtype, ht.float)
-            self.assertEqual(ret00.split, 0)
-
-            # splits 1 None
-            a = ht.ones((n, m), split=1)
-            b = ht.ones((j, k), split=None)
-            a[0] = ht.arange(1, m + 1)
-            a[:, -1] = ht.arange(1, n + 1)
-            b[0] = ht.arange(1, k + 1)
-            b[:, 0] = ht.arange(1, j + 1)
-            ret00 = ht.matmul(a, b)
-
-            ret_comp1 = ht.array(a_torch @ b_torch, split=1)
-            self.assertTrue(ht.equal(ret00, ret_comp1))
-            self.assertIsInstance(ret00, ht.DNDarray)
-            self.assertEqual(ret00.shape, (n, k))
-            self.assertEqual(ret00.dtype, ht.float)
-            self.assertEqual(ret00.split, 1)
-
-            # splits None 0
-            a = ht.ones((n, m), split=None)
-            b = ht.ones((j, k), split=0)
-            a[0] = ht.arange(1, m + 1)
-            a[:, -1] = ht.arange(1, n + 1)
-            b[0] = ht.arange(1, k + 1)
-            b[:, 0] = ht.arange(1, j + 1)
-            ret00 = ht.matmul(a, b)
-
-            ret_comp = ht.array(a_torch @ b_torch, split=0)
-            self.assertTrue(ht.equal(ret00, ret_comp))
-            self.assertIsInstance(ret00, ht.DNDarray)
-            self.assertEqual(ret00.shape, (n, k))
-            self.assertEqual(ret00.dtype, ht.float)
-            self.assertEqual(ret00.split, 0)
-
-            # splits None 1
-            a = ht.ones((n, m), split=None)
-            b = ht.ones((j, k), split=1)
-            a[0] = ht.arange(1, m + 1)
-            a[:, -1] = ht.arange(1, n + 1)
-            b[0] = ht.arange(1, k + 1)
-            b[:, 0] = ht.arange(1, j + 1)
-            ret00 = ht.matmul(a, b)
-
-            ret_comp = ht.array(a_torch @ b_torch, split=1)
-            self.assertTrue(ht.equal(ret00, ret_comp))
-            self.assertIsInstance(ret00, ht.DNDarray)
-            self.assertEqual(ret00.shape, (n, k))
-            self.assertEqual(ret00.dtype, ht.float)
-            self.assertEqual(ret00.split, 1)
-
-            # vector matrix mult:
-            # a -> vector
-            a_torch = torch.ones((m), device=self.device.torch_device)
-            b_torch = torch.ones((j, k), device=self.device.torch_device)
-            b_torch[0] = torch.arange(1, k + 1, device=self.device.torch_device)
-            b_torch[:, 0] = torch.arange(1, j + 1, device=self.device.torch_device)
-            # splits None None
-            a = ht.ones((m), split=None)
-            b = ht.ones((j, k), split=None)
-            b[0] = ht.arange(1, k + 1)
-            b[:, 0] = ht.arange(1, j + 1)
-            ret00 = ht.matmul(a, b)
-
-            ret_comp = ht.array(a_torch @ b_torch, split=None)
-            self.assertTrue(ht.equal(ret00, ret_comp))
-            self.assertIsInstance(ret00, ht.DNDarray)
-            self.assertEqual(ret00.shape, (k,))
-            self.assertEqual(ret00.dtype, ht.float)
-            self.assertEqual(ret00.split, None)
-
-            # splits None 0
-            a = ht.ones((m), split=None)
-            b = ht.ones((j, k), split=0)
-            b[0] = ht.arange(1, k + 1)
-            b[:, 0] = ht.arange(1, j + 1)
-            ret00 = ht.matmul(a, b)
-
-            ret_comp = ht.array(a_torch @ b_torch, split=None)
-            self.assertTrue(ht.equal(ret00, ret_comp))
-            self.assertIsInstance(ret00, ht.DNDarray)
-            self.assertEqual(ret00.shape, (k,))
-            self.assertEqual(ret00.dtype, ht.float)
-            self.assertEqual(ret00.split, 0)
-
-            # splits None 1
-            a = ht.ones((m), split=None)
-            b = ht.ones((j, k), split=1)
-            b[0] = ht.arange(1, k + 1)
-            b[:, 0] = ht.arange(1, j + 1)
-            ret00 = ht.matmul(a, b)
-            ret_comp = ht.array(a_torch @ b_torch, split=0)
-            self.assertTrue(ht.equal(ret00, ret_comp))
-            self.assertIsInstance(ret00, ht.DNDarray)
-            self.assertEqual(ret00.shape, (k,))
-            self.assertEqual(ret00.dtype, ht.float)
-            self.assertEqual(ret00.split, 0)
-
-            # splits 0 None
-            a = ht.ones((m), split=None)
-            b = ht.ones((j, k), split=0)
-            b[0] = ht.arange(1, k + 1)
-            b[:, 0] = ht.arange(1, j + 1)
-            ret00 = ht.matmul(a, b)
-
-            ret_comp = ht.array(a_torch @ b_torch, split=None)
-            self.assertTrue(ht.equal(ret00, ret_comp))
-            self.assertIsInstance(ret00, ht.DNDarray)
-            self.assertEqual(ret00.shape, (k,))
-            self.assertEqual(ret00.dtype, ht.float)
-            self.assertEqual(ret00.split, 0)
-
-            # splits 0 0
-            a = ht.ones((m), split=0)
-            b = ht.ones((j, k), split=0)
-            b[0] = ht.arange(1, k + 1)
-            b[:, 0] = ht.arange(1, j + 1)
-            ret00 = ht.matmul(a, b)
-
-            ret_comp = ht.array(a_torch @ b_torch, split=None)
-            self.assertTrue(ht.equal(ret00, ret_comp))
-            self.assertIsInstance(ret00, ht.DNDarray)
-            self.assertEqual(ret00.shape, (k,))
-            self.assertEqual(ret00.dtype, ht.float)
-            self.assertEqual(ret00.split, 0)
-
-            # splits 0 1
-            a = ht.ones((m), split=0)
-            b = ht.ones((j, k), split=1)
-            b[0] = ht.arange(1, k + 1)
-            b[:, 0] = ht.arange(1, j + 1)
-            ret00 = ht.matmul(a, b)
-
-            ret_comp = ht.array(a_torch @ b_torch, split=None)
-            self.assertTrue(ht.equal(ret00, ret_comp))
-            self.assertIsInstance(ret00, ht.DNDarray)
-            self.assertEqual(ret00.shape, (k,))
-            self.assertEqual(ret00.dtype, ht.float)
-            self.assertEqual(ret00.split, 0)
-
-            # b -> vector
-            a_torch = torch.ones((n, m), device=self.device.torch_device)
-            a_torch[0] = torch.arange(1, m + 1, device=self.device.torch_device)
-            a_torch[:, -1] = torch.arange(1, n + 1, device=self.device.torch_device)
-            b_torch = torch.ones((j), device=self.device.torch_device)
-            # splits None None
-            a = ht.ones((n, m), split=None)
-            b = ht.ones((j), split=None)
-            a[0] = ht.arange(1, m + 1)
-            a[:, -1] = ht.arange(1, n + 1)
-            ret00 = ht.matmul(a, b)
-
-            ret_comp = ht.array(a_torch @ b_torch, split=None)
-            self.assertTrue(ht.equal(ret00, ret_comp))
-            self.assertIsInstance(ret00, ht.DNDarray)
-            self.assertEqual(ret00.shape, (n,))
-            self.assertEqual(ret00.dtype, ht.float)
-            self.assertEqual(ret00.split, None)
-
-            a = ht.ones((n, m), split=None, dtype=ht.int64)
-            b = ht.ones((j), split=None, dtype=ht.int64)
-            a[0] = ht.arange(1, m + 1, dtype=ht.int64)
-            a[:, -1] = ht.arange(1, n + 1, dtype=ht.int64)
-            ret00 = ht.matmul(a, b)
-
-            ret_comp = ht.array((a_torch @ b_torch), split=None)
-            self.assertTrue(ht.equal(ret00, ret_comp))
-            self.assertIsInstance(ret00, ht.DNDarray)
-            self.assertEqual(ret00.shape, (n,))
-            self.assertEqual(ret00.dtype, ht.int64)
-            self.assertEqual(ret00.split, None)
-
-            # splits 0 None
-            a = ht.ones((n, m), split=0)
-            b = ht.ones((j), split=None)
-            a[0] = ht.arange(1, m + 1)
-            a[:, -1] = ht.arange(1, n + 1)
-            ret00 = ht.matmul(a, b)
-
-            ret_comp = ht.array((a_torch @ b_torch), split=None)
-            self.assertTrue(ht.equal(ret00, ret_comp))
-            self.assertIsInstance(ret00, ht.DNDarray)
-            self.assertEqual(ret00.shape, (n,))
-            self.assertEqual(ret00.dtype, ht.float)
-            self.assertEqual(ret00.split, 0)
-
-            a = ht.ones((n, m), split=0, dtype=ht.int64)
-            b = ht.ones((j), split=None, dtype=ht.int64)
-            a[0] = ht.arange(1, m + 1, dtype=ht.int64)
-            a[:, -1] = ht.arange(1, n + 1, dtype=ht.int64)
-            ret00 = ht.matmul(a, b)
-
-            ret_comp = ht.array((a_torch @ b_torch), split=None)
-            self.assertTrue(ht.equal(ret00, ret_comp))
-            self.assertIsInstance(ret00, ht.DNDarray)
-            self.assertEqual(ret00.shape, (n,))
-            self.assertEqual(ret00.dtype, ht.int64)
-            self.assertEqual(ret00.split, 0)
-
-            # splits 1 None
-            a = ht.ones((n, m), split=1)
-            b = ht.ones((j), split=None)
-            a[0] = ht.arange(1, m + 1)
-            a[:, -1] = ht.arange(1, n + 1)
-            ret00 = ht.matmul(a, b)
-
-            ret_comp = ht.array((a_torch @ b_torch), split=None)
-            self.assertTrue(ht.equal(ret00, ret_comp))
-            self.assertIsInstance(ret00, ht.DNDarray)
-            self.assertEqual(ret00.shape, (n,))
-            self.assertEqual(ret00.dtype, ht.float)
-            self.assertEqual(ret00.split, 0)
-
-            a = ht.ones((n, m), split=1, dtype=ht.int64)
-            b = ht.ones((j), split=None, dtype=ht.int64)
-            a[0] = ht.arange(1, m + 1, dtype=ht.int64)
-            a[:, -1] = ht.arange(1, n + 1, dtype=ht.int64)
-            ret00 = ht.matmul(a, b)
-
-            ret_comp = ht.array((a_torch @ b_torch), split=None)
-            self.assertTrue(ht.equal(ret00, ret_comp))
-            self.assertIsInstance(ret00, ht.DNDarray)
-            self.assertEqual(ret00.shape, (n,))
-            self.assertEqual(ret00.dtype, ht.int64)
-            self.assertEqual(ret00.split, 0)
-
-            # splits None 0
-            a = ht.ones((n, m), split=None)
-            b = ht.ones((j), split=0)
-            a[0] = ht.arange(1, m + 1)
-            a[:, -1] = ht.arange(1, n + 1)
-            ret00 = ht.matmul(a, b)
-
-            ret_comp = ht.array((a_torch @ b_torch), split=None)
-            self.assertTrue(ht.equal(ret00, ret_comp))
-            self.assertIsInstance(ret00, ht.DNDarray)
-            self.assertEqual(ret00.shape, (n,))
-            self.assertEqual(ret00.dtype, ht.float)
-            self.assertEqual(ret00.split, 0)
-
-            a = ht.ones((n, m), split=None, dtype=ht.int64)
-            b = ht.ones((j), split=0, dtype=ht.int64)
-            a[0] = ht.arange(1, m + 1, dtype=ht.int64)
-            a[:, -1] = ht.arange(1, n + 1, dtype=ht.int64)
-            ret00 = ht.matmul(a, b)
-
-            ret_comp = ht.array((a_torch @ b_torch), split=None)
-            self.assertTrue(ht.equal(ret00, ret_comp))
-            self.assertIsInstance(ret00, ht.DNDarray)
-            self.assertEqual(ret00.shape, (n,))
-            self.assertEqual(ret00.dtype, ht.int64)
-            self.assertEqual(ret00.split, 0)
-
-            # splits 0 0
-            a = ht.ones((n, m), split=0)
-            b = ht.ones((j), split=0)
-            a[0] = ht.arange(1, m + 1)
-            a[:, -1] = ht.arange(1, n + 1)
-            ret00 = ht.matmul(a, b)
-
-            ret_comp = ht.array((a_torch @ b_torch), split=None)
-            self.assertTrue(ht.equal(ret00, ret_comp))
-            self.assertIsInstance(ret00, ht.DNDarray)
-            self.assertEqual(ret00.shape, (n,))
-            self.assertEqual(ret00.dtype, ht.float)
-            self.assertEqual(ret00.split, 0)
-
-            a = ht.ones((n, m), split=0, dtype=ht.int64)
-            b = ht.ones((j), split=0, dtype=ht.int64)
-            a[0] = ht.arange(1, m + 1, dtype=ht.int64)
-            a[:, -1] = ht.arange(1, n + 1, dtype=ht.int64)
-            ret00 = ht.matmul(a, b)
-
-            ret_comp = ht.array((a_torch @ b_torch), split=None)
-            self.assertTrue(ht.equal(ret00, ret_comp))
-            self.assertIsInstance(ret00, ht.DNDarray)
-            self.assertEqual(ret00.shape, (n,))
-            self.assertEqual(ret00.dtype, ht.int64)
-            self.assertEqual(ret00.split, 0)
-
-            # splits 1 0
-            a = ht.ones((n, m), split=1)
-            b = ht.ones((j), split=0)
-            a[0] = ht.arange(1, m + 1)
-            a[:, -1] = ht.arange(1, n + 1)
-            ret00 = ht.matmul(a, b)
-
-            ret_comp = ht.array((a_torch @ b_torch), split=None)
-            self.assertTrue(ht.equal(ret00, ret_comp))
-            self.assertIsInstance(ret00, ht.DNDarray)
-            self.assertEqual(ret00.shape, (n,))
-            self.assertEqual(ret00.dtype, ht.float)
-            self.assertEqual(ret00.split, 0)
-
-            a = ht.ones((n, m), split=1, dtype=ht.int64)
-            b = ht.ones((j), split=0, dtype=ht.int64)
-            a[0] = ht.arange(1, m + 1, dtype=ht.int64)
-            a[:, -1] = ht.arange(1, n + 1, dtype=ht.int64)
-            ret00 = ht.matmul(a, b)
-
-            ret_comp = ht.array((a_torch @ b_torch), split=None)
-            self.assertTrue(ht.equal(ret00, ret_comp))
-            self.assertIsInstance(ret00, ht.DNDarray)
-            self.assertEqual(ret00.shape, (n,))
-            self.assertEqual(ret00.dtype, ht.int64)
-            self.assertEqual(ret00.split, 0)
-
-            with self.assertRaises(NotImplementedError):
-                a = ht.zeros((3, 3, 3), split=2)
-                b = a.copy()
-                a @ b
+        with self.assertRaises(NotImplementedError):
+            a = ht.zeros((3, 3, 3), split=2)
+            b = a.copy()
+            a @ b
+
+    @unittest.skipUnless(ht.MPI_WORLD.size > 1, "only meaningful with more than one process")
+    def test_matmul_distributed(self):
+        n, m = 21, 31
+        j, k = m, 45
+        a_torch = _seeded(n, m, self.device.torch_device)
+        b_torch = _seeded(j, k, self.device.torch_device, col=0)
+        # reference results, each computed once instead of per assertion
+        ref_mm = a_torch @ b_torch
+
+        # matrix @ matrix: (split_a, dtype_a, split_b, dtype_b, split_out)
+        mat_mat = [
+            (0, ht.float64, 0, ht.float32, 0),
+            (0, ht.float64, 0, ht.float64, 0),
+            (0, ht.float32, 1, ht.float64, 0),
+            (1, ht.float32, 0, ht.float32, 1),
+            (1, ht.float32, 1, ht.float32, 1),
+            (0, ht.float32, None, ht.float32, 0),
+            (1, ht.float32, None, ht.float32, 1),
+            (None, ht.float32, 0, ht.float32, 0),
+            (None, ht.float32, 1, ht.float32, 1),
+        ]
+        for sa, dta, sb, dtb, sout in mat_mat:
+            with self.subTest(splits=(sa, sb), dtypes=(dta, dtb)):
+                a = self._operands[((n, m), dta, sa)]
+                b = self._operands[((j, k), dtb, sb)]
+                ret = ht.matmul(a, b)
+
+                self._assert_matches_full(ret, ref_mm)
+                self.assertIsInstance(ret, ht.DNDarray)
+                self.assertEqual(ret.shape, (n, k))
+                self.assertEqual(ret.dtype, ht.promote_types(dta, dtb))
+                self.assertEqual(ret.split, sout)
+
+        # vector @ matrix: (split_a, split_b, split_out)
+        avec_torch = torch.ones((m), device=self.device.torch_device)
+        ref_vm = avec_torch @ b_torch
+        vec_mat = [
+            (None, None, None),
+            (None, 0, 0),
+            (None, 1, 0),
+            (0, 0, 0),
+            (0, 1, 0),
+        ]
+        for sa, sb, sout in vec_mat:
+            with self.subTest(splits=(sa, sb)):
+                a = self._operands[((m,), ht.float32, sa)]
+                b = self._operands[((j, k), ht.float32, sb)]
+                ret = ht.matmul(a, b)
+
+                self._assert_matches_full(ret, ref_vm)
+                self.assertIsInstance(ret, ht.DNDarray)
+                self.assertEqual(ret.shape, (k,))
+                self.assertEqual(ret.dtype, ht.float)
+                self.assertEqual(ret.split, sout)
+
+        # matrix @ vector: (split_a, split_b, dtype, split_out)
+        bvec_torch = torch.ones((j), device=self.device.torch_device)
+        ref_mv = a_torch @ bvec_torch
+        ref_mv_i64 = ref_mv.to(torch.int64)
+        mat_vec = [
+            (None, None, ht.float32, None),
+            (None, None, ht.int64, None),
+            (0, None, ht.float32, 0),
+            (0, None, ht.int64, 0),
+            (1, None, ht.float32, 0),
+            (1, None, ht.int64, 0),
+            (None, 0, ht.float32, 0),
+            (None, 0, ht.int64, 0),
+            (0, 0, ht.float32, 0),
+            (0, 0, ht.int64, 0),
+            (1, 0, ht.float32, 0),
+            (1, 0, ht.int64, 0),
+        ]
+        for sa, sb, dt, sout in mat_vec:
+            with self.subTest(splits=(sa, sb), dtype=dt):
+                a = self._operands[((n, m), dt, sa)]
+                b = self._operands[((m,), dt, sb)]
+                ret = ht.matmul(a, b)
+
+                self._assert_matches_full(ret, ref_mv if dt == ht.float32 else ref_mv_i64)
+                self.assertIsInstance(ret, ht.DNDarray)
+                self.assertEqual(ret.shape, (n,))
+                self.assertEqual(ret.dtype, dt)
+                self.assertEqual(ret.split, sout)
+
 
     def test_norm(self):
-        a = ht.arange(9, dtype=ht.float32, split=0) - 4
-        self.assertTrue(
-            ht.allclose(ht.linalg.norm(a), ht.float32(np.linalg.norm(a.numpy())).item(), atol=1e-5)
-        )
+        # the operands are built from full torch tensors, so each reference
+        # norm can be computed once on device instead of gathering through
+        # .numpy() before and after every resplit
+        a_torch = torch.arange(9, dtype=torch.float32, device=self.device.torch_device) - 4
+        a = ht.array(a_torch, split=0)
+        ref_a = float(torch.linalg.norm(a_torch))
+        self.assertTrue(ht.allclose(ht.linalg.norm(a), ref_a, atol=1e-5))
         a.resplit_(axis=None)
-        self.assertTrue(
-            ht.allclose(ht.linalg.norm(a), ht.float32(np.linalg.norm(a.numpy())).item(), atol=1e-5)
-        )
+        self.assertTrue(ht.allclose(ht.linalg.norm(a), ref_a, atol=1e-5))
 
-        b = ht.array([[-4.0, -3.0, -2.0], [-1.0, 0.0, 1.0], [2.0, 3.0, 4.0]], split=0)
-        self.assertTrue(
-            ht.allclose(ht.linalg.norm(b), ht.float32(np.linalg.norm(b.numpy())).item(), atol=1e-5)
+        b_torch = torch.tensor(
+            [[-4.0, -3.0, -2.0], [-1.0, 0.0, 1.0], [2.0, 3.0, 4.0]],
+            device=self.device.torch_device,
         )
+        b = ht.array(b_torch, split=0)
+        ref_b = float(torch.linalg.norm(b_torch))
+        self.assertTrue(ht.allclose(ht.linalg.norm(b), ref_b, atol=1e-5))
         b.resplit_(axis=1)
-        self.assertTrue(
-            ht.allclose(ht.linalg.norm(b), ht.float32(np.linalg.norm(b.numpy())).item(), atol=1e-5)
-        )
+        self.assertTrue(ht.allclose(ht.linalg.norm(b), ref_b, atol=1e-5))
 
         with self.assertRaises(TypeError):
             c = np.arange(9) - 4
@@ -562,9 +498,10 @@ class TestLinalgBasics(TestCase):
         a = ht.arange(3, dtype=ht.int32)
         b = ht.arange(8, dtype=ht.float32)
         ht_outer = ht.outer(a, b, split=None)
-        np_outer = np.outer(a.numpy(), b.numpy())
+        # on-device reference, computed once; the cases below compare their
+        # local chunks against it instead of gathering through .numpy()
         t_outer = torch.einsum("i,j->ij", a.larray, b.larray)
-        self.assertTrue((ht_outer.numpy() == np_outer).all())
+        self._assert_matches_full(ht_outer, t_outer)
         self.assertTrue(ht_outer.larray.dtype is t_outer.dtype)
 
         # test outer, a and b distributed, no data on some ranks
@@ -575,37 +512,42 @@ class TestLinalgBasics(TestCase):
         # a and b split 0, outer split 1
         ht_outer_split = ht.outer(a_split, b_split, split=1)
         self.assertTrue(ht_outer_split.split == 1)
-        self.assertTrue((ht_outer_split.numpy() == np_outer).all())
+        self._assert_matches_full(ht_outer_split, t_outer)
 
         # a and b distributed, outer split unspecified
         ht_outer_split = ht.outer(a_split, b_split, split=None)
         self.assertTrue(ht_outer_split.split == 0)
-        self.assertTrue((ht_outer_split.numpy() == np_outer).all())
+        self._assert_matches_full(ht_outer_split, t_outer)
 
         # a not distributed, outer.split = 1
         ht_outer_split = ht.outer(a, b_split, split=1)
         self.assertTrue(ht_outer_split.split == 1)
-        self.assertTrue((ht_outer_split.numpy() == np_outer).all())
+        self._assert_matches_full(ht_outer_split, t_outer)
 
         # b not distributed, outer.split = 0
         ht_outer_split = ht.outer(a_split, b, split=0)
         self.assertTrue(ht_outer_split.split == 0)
-        self.assertTrue((ht_outer_split.numpy() == np_outer).all())
-
-        # a_split.ndim > 1 and a.split != 0
-        a_split_3d = ht.random.randn(3, 3, 3, dtype=ht.float64, split=2)
+        self._assert_matches_full(ht_outer_split, t_outer)
+
+        # a_split.ndim > 1 and a.split != 0; deterministic values instead of
+        # randn, so the reference comes from the local torch data without a
+        # gather (the test only needs non-trivial contents, not randomness)
+        a3_torch = torch.linspace(
+            0, 1, 27, dtype=torch.float64, device=self.device.torch_device
+        ).reshape(3, 3, 3)
+        a_split_3d = ht.array(a3_torch, split=2)
         ht_outer_split = ht.outer(a_split_3d, b_split)
-        np_outer_3d = np.outer(a_split_3d.numpy(), b_split.numpy())
+        t_outer_3d = torch.einsum("i,j->ij", a3_torch.flatten(), b.larray.double())
         self.assertTrue(ht_outer_split.split == 0)
-        self.assertTrue((ht_outer_split.numpy() == np_outer_3d).all())
+        self._assert_matches_full(ht_outer_split, t_outer_3d)
 
         # write to out buffer
         ht_out = ht.empty((a.gshape[0], b.gshape[0]), dtype=ht.float32)
         ht.outer(a, b, out=ht_out)
-        self.assertTrue((ht_out.numpy() == np_outer).all())
+        self._assert_matches_full(ht_out, t_outer)
         ht_out_split = ht.empty((a_split.gshape[0], b_split.gshape[0]), dtype=ht.float32, split=1)
         ht.outer(a_split, b_split, out=ht_out_split, split=1)
-        self.assertTrue((ht_out_split.numpy() == np_outer).all())
+        self._assert_matches_full(ht_out_split, t_outer)
 
         # test exceptions
         t_a = torch.arange(3)
@@ -632,17 +574,17 @@ class TestLinalgBasics(TestCase):
     def test_projection(self):
         a = ht.arange(1, 4, dtype=ht.float32, split=None)
         e1 = ht.array([1, 0, 0], dtype=ht.float32, split=None)
-        self.assertTrue(ht.equal(ht.linalg.projection(a, e1), e1))
+        self._assert_close_ht(ht.linalg.projection(a, e1), e1)
 
         a.resplit_(axis=0)
-        self.assertTrue(ht.equal(ht.linalg.projection(a, e1), e1))
+        self._assert_close_ht(ht.linalg.projection(a, e1), e1)
 
         e2 = ht.array([0, 1, 0], dtype=ht.float32, split=0)
-        self.assertTrue(ht.equal(ht.linalg.projection(a, e2), e2 * 2))
+        self._assert_close_ht(ht.linalg.projection(a, e2), e2 * 2)
 
         a = ht.arange(1, 4, dtype=ht.float32, split=None)
         e3 = ht.array([0, 0, 1], dtype=ht.float32, split=0)
-        self.assertTrue(ht.equal(ht.linalg.projection(a, e3), e3 * 3))
+        self._assert_close_ht(ht.linalg.projection(a, e3), e3 * 3)
 
         a = np.arange(1, 4)
         with self.assertRaises(TypeError):
@@ -652,178 +594,156 @@ class TestLinalgBasics(TestCase):
         with self.assertRaises(RuntimeError):
             ht.linalg.projection(a, e1)
 
-    def test_trace(self):
+    def test_trace_exceptions(self):
+        # one (kwargs, expected exception) table instead of open-coded raise
+        # blocks; argument validation runs before any data movement, so one
+        # local and one distributed operand cover both dispatch paths
+        bad_kwargs = [
+            ({"axis1": 0.2}, TypeError),
+            ({"axis2": 1.4}, TypeError),
+            ({"axis1": 2}, ValueError),
+            ({"axis2": 2}, ValueError),
+            ({"offset": 1.2}, TypeError),
+            ({"axis1": 1, "axis2": 1}, ValueError),
+            ({"dtype": "ht.int64"}, ValueError),
+            ({"dtype": "ht.float32"}, ValueError),
+            ({"out": []}, TypeError),
+            # the result is scalar, so any out array is rejected before its
+            # storage is touched and an uninitialized one is enough
+            ({"out": ht.empty((1,))}, ValueError),
+        ]
+        for x in (self._x2d, ht.arange(24, split=0).reshape((6, 4))):
+            for kwargs, exc in bad_kwargs:
+                with self.subTest(split=x.split, kwargs=str(kwargs)):
+                    with self.assertRaises(exc):
+                        ht.trace(x, **kwargs)
+        with self.assertRaises(TypeError):
+            ht.trace("[[1, 2], [3, 4]]")
+        with self.assertRaises(ValueError):
+            ht.trace(ht.arange(24))
+
+    def test_trace_local(self):
         # ------------------------------------------------
         # UNDISTRIBUTED CASE
         # ------------------------------------------------
         # CASE 2-D
         # ------------------------------------------------
-        x = ht.arange(24).reshape((6, 4))
-        x_np = x.numpy()
+        x = self._x2d
+        x_np = self._x2d_np
         dtype = ht.float32
 
         result = ht.trace(x)
-        result_np = np.trace(x_np)
         self.assertIsInstance(result, int)
-        self.assertEqual(result, result_np)
+        self._assert_trace_matches(result, x)
 
         # direct call
         result = x.trace()
         self.assertIsInstance(result, int)
-        self.assertEqual(result, result_np)
+        self._assert_trace_matches(result, x)
 
-        # input = array_like (other than DNDarray)
-        result = ht.trace(x.tolist())
+        # input = array_like (other than DNDarray); NumPy stays the oracle
+        # for the non-DNDarray entry point
+        result = ht.trace(self._x2d_list)
         self.assertIsInstance(result, int)
-        self.assertEqual(result, result_np)
+        self.assertEqual(result, self._trace_ref(x_np))
 
         # dtype
         result = ht.trace(x, dtype=dtype)
-        result_np = np.trace(x_np, dtype=np.float32)
         self.assertIsInstance(result, float)
-        self.assertEqual(result, result_np)
+        self._assert_trace_matches(result, x)
 
         # offset != 0
         # negative offset
         o = -(x.gshape[0] - 1)
         result = ht.trace(x, offset=o)
-        result_np = np.trace(x_np, offset=o)
         self.assertIsInstance(result, int)
-        self.assertEqual(result, result_np)
+        self._assert_trace_matches(result, x, offset=o)
 
         # positive offset
         o = x.gshape[1] - 1
         result = ht.trace(x, offset=o)
-        result_np = np.trace(x_np, offset=o)
         self.assertIsInstance(result, int)
-        self.assertEqual(result, result_np)
+        self._assert_trace_matches(result, x, offset=o)
 
         # offset resulting into empty array
         # negative
         o = -x.gshape[0]
         result = ht.trace(x, offset=o)
-        result_np = np.trace(x_np, offset=o)
         self.assertIsInstance(result, int)
+        # the diagonal is empty by construction, no NumPy oracle needed
         self.assertEqual(result, 0)
-        self.assertEqual(result, result_np)
 
         # positive
         o = x.gshape[1]
         result = ht.trace(x, offset=o)
-        result_np = np.trace(x_np, offset=o)
         self.assertIsInstance(result, int)
+        # the diagonal is empty by construction, no NumPy oracle needed
         self.assertEqual(result, 0)
-        self.assertEqual(result, result_np)
-
-        # Exceptions
-        with self.assertRaises(TypeError):
-            x = "[[1, 2], [3, 4]]"
-            ht.trace(x)
-        with self.assertRaises(ValueError):
-            x = ht.arange(24)
-            ht.trace(x)
-        with self.assertRaises(TypeError):
-            x = ht.arange(24).reshape((6, 4))
-            ht.trace(x, axis1=0.2)
-        with self.assertRaises(TypeError):
-            ht.trace(x, axis2=1.4)
-        with self.assertRaises(ValueError):
-            ht.trace(x, axis1=2)
-        with self.assertRaises(ValueError):
-            ht.trace(x, axis2=2)
-        with self.assertRaises(TypeError):
-            ht.trace(x, offset=1.2)
-        with self.assertRaises(ValueError):
-            ht.trace(x, axis1=1, axis2=1)
-        with self.assertRaises(ValueError):
-            ht.trace(x, dtype="ht.int64")
-        with self.assertRaises(TypeError):
-            ht.trace(x, out=[])
-        with self.assertRaises(ValueError):
-            # As result is scalar
-            out = ht.array([])
-            ht.trace(x, out=out)
-        with self.assertRaises(ValueError):
-            ht.trace(x, dtype="ht.float32")
 
         # ------------------------------------------------
         # CASE > 2-D (4D)
         # ------------------------------------------------
-        x = ht.arange(24).reshape((1, 2, 3, 4))
-        x_np = x.numpy()
+        x = self._x4d
+        x_np = self._x4d_np
         out = ht.empty((3, 4))
         axis1 = 1
         axis2 = 3
 
         result = ht.trace(x)
-        result_np = np.trace(x_np)
         self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, result_np)
+        self._assert_trace_matches(result, x)
 
-        # input = array_like (other than DNDarray)
-        result = ht.trace(x.tolist())
+        # input = array_like (other than DNDarray); NumPy stays the oracle
+        # for the non-DNDarray entry point
+        result = ht.trace(self._x4d_list)
         self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, result_np)
+        self._assert_matches_np(result, self._trace_ref(x_np))
 
         # out
         result = ht.trace(x, out=out)
-        result_np = np.trace(x_np)
         self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, result_np)
-        self.assert_array_equal(out, result_np)
+        self._assert_trace_matches(result, x)
+        self._assert_trace_matches(out, x)
 
         result = ht.trace(x, axis1=axis1, axis2=axis2)
-        result_np = np.trace(x_np, axis1=axis1, axis2=axis2)
         self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, result_np)
+        self._assert_trace_matches(result, x, axis1=axis1, axis2=axis2)
 
         # reversed axes order
         result = ht.trace(x, axis1=axis2, axis2=axis1)
-        result_np = np.trace(x_np, axis1=axis1, axis2=axis2)
         self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, result_np)
+        self._assert_trace_matches(result, x, axis1=axis2, axis2=axis1)
 
-        # negative axes
+        # all four axis sign combinations (the all-positive pair included)
         axis1 = 1
         axis2 = 2
-        result = ht.trace(x, axis1=axis1, axis2=-axis2)
-        result_np = np.trace(x_np, axis1=axis1, axis2=-axis2)
-        self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, result_np)
-
-        result = ht.trace(x, axis1=-axis1, axis2=axis2)
-        result_np = np.trace(x_np, axis1=-axis1, axis2=axis2)
-        self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, result_np)
-
-        result = ht.trace(x, axis1=-axis1, axis2=-axis2)
-        result_np = np.trace(x_np, axis1=-axis1, axis2=-axis2)
-        self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, result_np)
+        for sign1, sign2 in itertools.product((1, -1), repeat=2):
+            a1, a2 = sign1 * axis1, sign2 * axis2
+            with self.subTest(axis1=a1, axis2=a2):
+                result = ht.trace(x, axis1=a1, axis2=a2)
+                self.assertIsInstance(result, ht.DNDarray)
+                self._assert_trace_matches(result, x, axis1=a1, axis2=a2)
 
         # different axes
         axis1 = 1
         axis2 = 2
         o = 0
         result = ht.trace(x, offset=o, axis1=axis1, axis2=axis2, dtype=dtype)
-        result_np = np.trace(x_np, offset=o, axis1=axis1, axis2=axis2, dtype=np.float32)
         self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, result_np)
+        self._assert_trace_matches(result, x, offset=o, axis1=axis1, axis2=axis2)
 
         # offset != 0
         # negative offset
         o = -(x.gshape[0] - 1)
         result = ht.trace(x, offset=o)
-        result_np = np.trace(x_np, offset=o)
         self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, result_np)
+        self._assert_trace_matches(result, x, offset=o)
 
         # positive offset
         o = x.gshape[1] - 1
         result = ht.trace(x, offset=o)
-        result_np = np.trace(x_np, offset=o)
         self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, result_np)
+        self._assert_trace_matches(result, x, offset=o)
 
         # offset resulting into zero array
         axis1 = 1
@@ -831,24 +751,22 @@ class TestLinalgBasics(TestCase):
         # negative
         o = -x.gshape[axis1]
         result = ht.trace(x, offset=o, axis1=axis1, axis2=axis2)
-        result_np = np.trace(x_np, offset=o, axis1=axis1, axis2=axis2)
         self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, np.zeros((1, 4)))
-        self.assert_array_equal(result, result_np)
+        self._assert_matches_np(result, np.zeros(_trace_zero_shape(x.gshape, axis1, axis2, o)))
 
         # positive
         o = x.gshape[axis2]
         result = ht.trace(x, offset=o, axis1=axis1, axis2=axis2)
-        result_np = np.trace(x_np, offset=o, axis1=axis1, axis2=axis2)
         self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, np.zeros((1, 4)))
-        self.assert_array_equal(result, result_np)
+        self._assert_matches_np(result, np.zeros(_trace_zero_shape(x.gshape, axis1, axis2, o)))
 
         # Exceptions
         with self.assertRaises(ValueError):
             out = ht.array([])
             ht.trace(x, out=out)
 
+    @unittest.skipIf(ht.MPI_WORLD.size == 1, "all split paths degenerate to the local case")
+    def test_trace_distributed(self):
         # ------------------------------------------------
         # DISTRIBUTED CASE
         # ------------------------------------------------
@@ -857,151 +775,118 @@ class TestLinalgBasics(TestCase):
         x = ht.arange(24, split=0).reshape((6, 4))
         x_np = np.arange(24).reshape((6, 4))
         dtype = ht.float32
+        # every out buffer this method passes, built in one place: each
+        # ht.empty binds the communicator and does split bookkeeping, so the
+        # buffers are constructed once and zeroed right before use
+        outs = {
+            ((1, 4), 0): ht.empty((1, 4), split=0, dtype=ht.int32),
+            ((3, 4, 1), 2): ht.empty((3, 4, 1), split=2, dtype=dtype),
+            ((1, 2, 4), 1): ht.empty((1, 2, 4), split=1, dtype=dtype),
+            ((1, 4), 1): ht.empty((1, 4), split=1, dtype=dtype),
+        }
 
         result = ht.trace(x)
-        result_np = np.trace(x_np)
         self.assertIsInstance(result, int)
-        self.assertEqual(result, result_np)
+        self._assert_trace_matches(result, x)
 
-        # different split axis
-        x_2 = ht.array(torch.arange(24).reshape((6, 4)), split=1)
+        # different split axis; construct distributed directly instead of
+        # scattering a fully materialized torch tensor
+        x_2 = ht.arange(24, split=0).reshape((6, 4), new_split=1)
         result = ht.trace(x_2)
-        result_np = np.trace(x_np)
         self.assertIsInstance(result, int)
-        self.assertEqual(result, result_np)
+        self._assert_trace_matches(result, x_2)
 
-        # input = array_like (other than DNDarray)
-        result = ht.trace(x.tolist())
+        # input = array_like (other than DNDarray); NumPy stays the oracle
+        # for the non-DNDarray entry point
+        result = ht.trace(self._x2d_list)
         self.assertIsInstance(result, int)
-        self.assertEqual(result, result_np)
+        self.assertEqual(result, self._trace_ref(x_np))
 
         # dtype
         result = ht.trace(x, dtype=dtype)
-        result_np = np.trace(x_np, dtype=np.float32)
         self.assertIsInstance(result, float)
-        self.assertEqual(result, result_np)
+        self._assert_trace_matches(result, x)
 
         # offset != 0
         # negative offset
         o = -(x.gshape[0] - 1)
         result = ht.trace(x, offset=o)
-        result_np = np.trace(x_np, offset=o)
         self.assertIsInstance(result, int)
-        self.assertEqual(result, result_np)
+        self._assert_trace_matches(result, x, offset=o)
 
         # positive offset
         o = x.gshape[1] - 1
         result = ht.trace(x, offset=o)
-        result_np = np.trace(x_np, offset=o)
         self.assertIsInstance(result, int)
-        self.assertEqual(result, result_np)
+        self._assert_trace_matches(result, x, offset=o)
 
         # offset resulting into empty array
         # negative
         o = -x.gshape[0]
         result = ht.trace(x, offset=o)
-        result_np = np.trace(x_np, offset=o)
         self.assertIsInstance(result, int)
+        # the diagonal is empty by construction, no NumPy oracle needed
         self.assertEqual(result, 0)
-        self.assertEqual(result, result_np)
 
         # positive
         o = x.gshape[1]
         result = ht.trace(x, offset=o)
-        result_np = np.trace(x_np, offset=o)
         self.assertIsInstance(result, int)
+        # the diagonal is empty by construction, no NumPy oracle needed
         self.assertEqual(result, 0)
-        self.assertEqual(result, result_np)
-
-        # Exceptions
-        with self.assertRaises(TypeError):
-            x = "[[1, 2], [3, 4]]"
-            ht.trace(x)
-        with self.assertRaises(ValueError):
-            x = ht.arange(24)
-            ht.trace(x)
-        with self.assertRaises(TypeError):
-            x = ht.arange(24).reshape((6, 4))
-            ht.trace(x, axis1=0.2)
-        with self.assertRaises(TypeError):
-            ht.trace(x, axis2=1.4)
-        with self.assertRaises(ValueError):
-            ht.trace(x, axis1=2)
-        with self.assertRaises(ValueError):
-            ht.trace(x, axis2=2)
-        with self.assertRaises(TypeError):
-            ht.trace(x, offset=1.2)
-        with self.assertRaises(ValueError):
-            ht.trace(x, axis1=1, axis2=1)
-        with self.assertRaises(ValueError):
-            ht.trace(x, dtype="ht.int64")
-        with self.assertRaises(TypeError):
-            ht.trace(x, out=[])
-        with self.assertRaises(ValueError):
-            # As result is scalar
-            out = ht.array([])
-            ht.trace(x, out=out)
 
         # ------------------------------------------------
         # CASE > 2-D (4D)
         # ------------------------------------------------
         x = ht.arange(24, split=0).reshape((1, 2, 3, 4))
-        x_np = x.numpy()
+        # the content is deterministic, so mirror it locally instead of
+        # allgathering the DNDarray
+        x_np = np.arange(24).reshape((1, 2, 3, 4))
         # ------------------------------------------------
         # CASE split axis NOT in (axis1, axis2)
         # ------------------------------------------------
         axis1 = 1
         axis2 = 2
-        out = ht.empty((1, 4), split=0, dtype=x.dtype)
+        out = outs[(1, 4), 0]
+        out.larray.zero_()
 
         result = ht.trace(x, axis1=axis1, axis2=axis2)
-        result_np = np.trace(x_np, axis1=axis1, axis2=axis2)
         self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, result_np)
+        self._assert_trace_matches(result, x, axis1=axis1, axis2=axis2)
 
-        # input = array_like (other than DNDarray)
-        result = ht.trace(x.tolist(), axis1=axis1, axis2=axis2)
+        # input = array_like (other than DNDarray); NumPy stays the oracle
+        # for the non-DNDarray entry point
+        result = ht.trace(self._x4d_list, axis1=axis1, axis2=axis2)
         self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, result_np)
+        self._assert_matches_np(result, self._trace_ref(x_np, axis1=axis1, axis2=axis2))
 
         # out
         result = ht.trace(x, out=out, axis1=axis1, axis2=axis2)
-        result_np = np.trace(x_np, axis1=axis1, axis2=axis2)
         self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, result_np)
-        self.assert_array_equal(out, result_np)
+        self._assert_trace_matches(result, x, axis1=axis1, axis2=axis2)
+        self._assert_trace_matches(out, x, axis1=axis1, axis2=axis2)
 
         # reversed axes order
         result = ht.trace(x, axis1=axis2, axis2=axis1)
-        result_np = np.trace(x_np, axis1=axis2, axis2=axis1)
         self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, result_np)
+        self._assert_trace_matches(result, x, axis1=axis2, axis2=axis1)
 
         # different axes (still not in x.split = 0)
         axis1 = 1
         axis2 = 3
         result = ht.trace(x, offset=0, axis1=axis1, axis2=axis2, dtype=dtype)
-        result_np = np.trace(x_np, offset=0, axis1=axis1, axis2=axis2, dtype=np.float32)
         self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, result_np)
+        self._assert_trace_matches(result, x, axis1=axis1, axis2=axis2)
 
-        # negative axes
+        # all four axis sign combinations (the all-positive pair included)
         axis1 = 1
         axis2 = 2
-        result = ht.trace(x, axis1=axis1, axis2=-axis2)
-        result_np = np.trace(x_np, axis1=axis1, axis2=-axis2)
-        self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, result_np)
-
-        result = ht.trace(x, axis1=-axis1, axis2=axis2)
-        result_np = np.trace(x_np, axis1=-axis1, axis2=axis2)
-        self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, result_np)
-
-        result = ht.trace(x, axis1=-axis1, axis2=-axis2)
-        result_np = np.trace(x_np, axis1=-axis1, axis2=-axis2)
-        self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, result_np)
+        for sign1, sign2 in itertools.product((1, -1), repeat=2):
+            a1, a2 = sign1 * axis1, sign2 * axis2
+            with self.subTest(axis1=a1, axis2=a2):
+                result = ht.trace(x, axis1=a1, axis2=a2)
+                self.assertIsInstance(result, ht.DNDarray)
+                self._assert_trace_matches(result, x, axis1=a1, axis2=a2)
 
         # offset != 0
         # negative offset
@@ -1009,16 +894,14 @@ class TestLinalgBasics(TestCase):
         axis2 = 2
         o = -(x.gshape[axis1] - 1)
         result = ht.trace(x, offset=o, axis1=axis1, axis2=axis2)
-        result_np = np.trace(x_np, offset=o, axis1=axis1, axis2=axis2)
         self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, result_np)
+        self._assert_trace_matches(result, x, offset=o, axis1=axis1, axis2=axis2)
 
         # positive offset
         o = x.gshape[axis2] - 1
         result = ht.trace(x, offset=o, axis1=axis1, axis2=axis2)
-        result_np = np.trace(x_np, offset=o, axis1=axis1, axis2=axis2)
         self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, result_np)
+        self._assert_trace_matches(result, x, offset=o, axis1=axis1, axis2=axis2)
 
         # offset resulting into zero array
         axis1 = 1
@@ -1026,43 +909,37 @@ class TestLinalgBasics(TestCase):
         # negative
         o = -x.gshape[axis1]
         result = ht.trace(x, offset=o, axis1=axis1, axis2=axis2)
-        result_np = np.trace(x_np, offset=o, axis1=axis1, axis2=axis2)
         self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, np.zeros((1, 4)))
-        self.assert_array_equal(result, result_np)
+        self._assert_matches_np(result, np.zeros(_trace_zero_shape(x.gshape, axis1, axis2, o)))
 
         # positive
         o = x.gshape[axis2]
         result = ht.trace(x, offset=o, axis1=axis1, axis2=axis2)
-        result_np = np.trace(x_np, offset=o, axis1=axis1, axis2=axis2)
         self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, np.zeros((1, 4)))
-        self.assert_array_equal(result, result_np)
+        self._assert_matches_np(result, np.zeros(_trace_zero_shape(x.gshape, axis1, axis2, o)))
 
         # different split axis (that is still not in (axis1, axis2))
         x = ht.arange(24).reshape((1, 2, 3, 4, 1))
         x = ht.array(x, split=2, dtype=dtype)
-        x_np = x.numpy()
         axis1 = 0
         axis2 = 1
-        out = ht.empty((3, 4, 1), split=2, dtype=x.dtype)
+        out = outs[(3, 4, 1), 2]
+        out.larray.zero_()
         result = ht.trace(x, axis1=axis1, axis2=axis2, out=out)
-        result_np = np.trace(x_np, axis1=axis1, axis2=axis2)
         self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, result_np)
-        self.assert_array_equal(out, result_np)
+        self._assert_trace_matches(result, x, axis1=axis1, axis2=axis2)
+        self._assert_trace_matches(out, x, axis1=axis1, axis2=axis2)
 
         # different split axis (that is still not in (axis1, axis2))
         x = ht.arange(24).reshape((1, 2, 3, 4, 1))
         x = ht.array(x, split=3, dtype=dtype)
-        x_np = x.numpy()
         axis1 = 2
         axis2 = 4
-        out = ht.empty((1, 2, 4), split=1, dtype=x.dtype)
+        out = outs[(1, 2, 4), 1]
+        out.larray.zero_()
         result = ht.trace(x, axis1=axis1, axis2=axis2, out=out)
-        result_np = np.trace(x_np, axis1=axis1, axis2=axis2)
         self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, result_np)
+        self._assert_trace_matches(result, x, axis1=axis1, axis2=axis2)
 
         # Exceptions
         with self.assertRaises(ValueError):
@@ -1072,89 +949,77 @@ class TestLinalgBasics(TestCase):
         # ------------------------------------------------
         # CASE split axis IN (axis1, axis2)
         # ------------------------------------------------
-        x = ht.arange(24).reshape((1, 2, 3, 4))
         split_axis = 1
-        x = ht.array(x, split=split_axis, dtype=dtype)
-        x_np = x.numpy()
+        x = ht.array(self._x4d, split=split_axis, dtype=dtype)
+        # deterministic content again: a local mirror replaces the allgather
+        x_np = np.arange(24, dtype=np.float32).reshape((1, 2, 3, 4))
         axis1 = 1
         axis2 = 2
-        result_shape = list(x.gshape)
-        del result_shape[axis1], result_shape[axis2 - 1]
-        out = ht.empty(tuple(result_shape), split=split_axis, dtype=x.dtype)
+        out = outs[(1, 4), split_axis]
+        out.larray.zero_()
 
         result = ht.trace(x, axis1=axis1, axis2=axis2)
-        result_np = np.trace(x_np, axis1=axis1, axis2=axis2)
         self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, result_np)
+        self._assert_trace_matches(result, x, axis1=axis1, axis2=axis2)
 
-        # input = array_like (other than DNDarray)
-        result = ht.trace(x.tolist(), axis1=axis1, axis2=axis2)
+        # input = array_like (other than DNDarray); NumPy stays the oracle
+        # for the non-DNDarray entry point. The list comes from the local
+        # mirror — DNDarray.tolist() would gather the split tensor first
+        result = ht.trace(x_np.tolist(), axis1=axis1, axis2=axis2)
         self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, result_np)
+        self._assert_matches_np(result, self._trace_ref(x_np, axis1=axis1, axis2=axis2))
 
         # out
         result = ht.trace(x, out=out, axis1=axis1, axis2=axis2)
-        result_np = np.trace(x_np, axis1=axis1, axis2=axis2)
         self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, result_np)
-        self.assert_array_equal(out, result_np)
+        self._assert_trace_matches(result, x, axis1=axis1, axis2=axis2)
+        self._assert_trace_matches(out, x, axis1=axis1, axis2=axis2)
 
         # reversed axes order
         result = ht.trace(x, axis1=axis2, axis2=axis1)
-        result_np = np.trace(x_np, axis1=axis2, axis2=axis1)
         self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, result_np)
+        self._assert_trace_matches(result, x, axis1=axis2, axis2=axis1)
 
         # axis2 = a.split
         axis1 = 0
         axis2 = 1
         result = ht.trace(x, axis1=axis1, axis2=axis2)
-        result_np = np.trace(x_np, axis1=axis1, axis2=axis2)
         self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, result_np)
+        self._assert_trace_matches(result, x, axis1=axis1, axis2=axis2)
 
         # offset != 0
         # negative offset
         o = -(x.gshape[0] - 1)
         result = ht.trace(x, offset=o, axis1=axis1, axis2=axis2)
-        result_np = np.trace(x_np, offset=o, axis1=axis1, axis2=axis2)
         self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, result_np)
+        self._assert_trace_matches(result, x, offset=o, axis1=axis1, axis2=axis2)
 
         # positive offset
         o = x.gshape[1] - 1
         result = ht.trace(x, offset=o, axis1=axis1, axis2=axis2)
-        result_np = np.trace(x_np, offset=o, axis1=axis1, axis2=axis2)
         self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, result_np)
+        self._assert_trace_matches(result, x, offset=o, axis1=axis1, axis2=axis2)
 
         # different axes
         axis1 = 1
         axis2 = 2
-        result_shape = list(x.gshape)
-        del result_shape[axis1], result_shape[axis2 - 1]
         o = 0
         result = ht.trace(x, offset=o, axis1=axis1, axis2=axis2, dtype=dtype)
-        result_np = np.trace(x_np, offset=o, axis1=axis1, axis2=axis2, dtype=np.float32)
         self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, result_np)
+        self._assert_trace_matches(result, x, offset=o, axis1=axis1, axis2=axis2)
 
         # offset resulting into zero array
         # negative
         o = -x.gshape[axis1]
         result = ht.trace(x, offset=o, axis1=axis1, axis2=axis2)
-        result_np = np.trace(x_np, offset=o, axis1=axis1, axis2=axis2)
         self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, np.zeros(result_shape, dtype=result_np.dtype))
-        self.assert_array_equal(result, result_np)
+        self._assert_matches_np(result, np.zeros(_trace_zero_shape(x.gshape, axis1, axis2, o)))
 
         # positive
         o = x.gshape[axis2]
         result = ht.trace(x, offset=o, axis1=axis1, axis2=axis2)
-        result_np = np.trace(x_np, offset=o, axis1=axis1, axis2=axis2)
         self.assertIsInstance(result, ht.DNDarray)
-        self.assert_array_equal(result, np.zeros(result_shape, dtype=result_np.dtype))
-        self.assert_array_equal(result, result_np)
+        self._assert_matches_np(result, np.zeros(_trace_zero_shape(x.gshape, axis1, axis2, o)))
 
         # Exceptions
         with self.assertRaises(ValueError):
@@ -1180,7 +1045,7 @@ class TestLinalgBasics(TestCase):
         self.assertEqual(simple_matrix_t.larray.shape, (4, 2))
 
         # 4D array, not distributed, with given axis
-        array_4d = ht.zeros((2, 3, 4, 5))
+        array_4d = self._zeros_4d
         array_4d_t = ht.transpose(array_4d, axes=(-1, 0, 2, 1))
         self.assertIsInstance(array_4d_t, ht.DNDarray)
         self.assertEqual(array_4d_t.dtype, ht.float32)
@@ -1195,7 +1060,7 @@ class TestLinalgBasics(TestCase):
         self.assertEqual(vector_split_t.dtype, ht.int32)
         self.assertEqual(vector_split_t.split, 0)
         self.assertEqual(vector_split_t.shape, (10,))
-        self.assertLessEqual(vector_split_t.lshape[0], 10)
+        self.assert_lshape_matches(vector_split_t, (-1,))
 
         # matrix transpose, distributed
         matrix_split = ht.ones((10, 20), split=1)
@@ -1204,21 +1069,16 @@ class TestLinalgBasics(TestCase):
         self.assertEqual(matrix_split_t.dtype, ht.float32)
         self.assertEqual(matrix_split_t.split, 0)
         self.assertEqual(matrix_split_t.shape, (20, 10))
-        self.assertLessEqual(matrix_split_t.lshape[0], 20)
-        self.assertEqual(matrix_split_t.lshape[1], 10)
+        self.assert_lshape_matches(matrix_split_t, (-1, 10))
 
         # 4D array, distributed
-        array_4d_split = ht.ones((3, 4, 5, 6), split=3)
+        array_4d_split = self._ones_4d_split
         array_4d_split_t = ht.transpose(array_4d_split, axes=(1, 0, 3, 2))
         self.assertIsInstance(array_4d_t, ht.DNDarray)
         self.assertEqual(array_4d_split_t.dtype, ht.float32)
         self.assertEqual(array_4d_split_t.split, 2)
         self.assertEqual(array_4d_split_t.shape, (4, 3, 6, 5))
-
-        self.assertEqual(array_4d_split_t.lshape[0], 4)
-        self.assertEqual(array_4d_split_t.lshape[1], 3)
-        self.assertLessEqual(array_4d_split_t.lshape[2], 6)
-        self.assertEqual(array_4d_split_t.lshape[3], 5)
+        self.assert_lshape_matches(array_4d_split_t, (4, 3, -1, 5))
 
         # exceptions
         with self.assertRaises(TypeError):
@@ -1235,11 +1095,20 @@ class TestLinalgBasics(TestCase):
             ht.zeros((2, 3)).transpose(axes=(0, 3))
 
     def test_tril(self):
+        # the lower-triangular mask depends only on shape and diagonal; build
+        # one ones base per shape and derive the three masks from it (tril is
+        # out-of-place), instead of re-materializing the base per case
+        masks = {}
+        for shape in ((5, 5), (4, 5), (5, 6)):
+            base = torch.ones(shape, device=self.device.torch_device)
+            for k in (-2, 0, 2):
+                masks[shape, k] = base.tril(diagonal=k)
+
         local_ones = ht.ones((5,))
 
         # 1D case, no offset, data is not split, module-level call
         result = ht.tril(local_ones)
-        comparison = torch.ones((5, 5), device=self.device.torch_device).tril()
+        comparison = masks[(5, 5), 0]
         self.assertIsInstance(result, ht.DNDarray)
         self.assertEqual(result.shape, (5, 5))
         self.assertEqual(result.lshape, (5, 5))
@@ -1248,7 +1117,7 @@ class TestLinalgBasics(TestCase):
 
         # 1D case, positive offset, data is not split, module-level call
         result = ht.tril(local_ones, k=2)
-        comparison = torch.ones((5, 5), device=self.device.torch_device).tril(diagonal=2)
+        comparison = masks[(5, 5), 2]
         self.assertIsInstance(result, ht.DNDarray)
         self.assertEqual(result.shape, (5, 5))
         self.assertEqual(result.lshape, (5, 5))
@@ -1257,7 +1126,7 @@ class TestLinalgBasics(TestCase):
 
         # 1D case, negative offset, data is not split, module-level call
         result = ht.tril(local_ones, k=-2)
-        comparison = torch.ones((5, 5), device=self.device.torch_device).tril(diagonal=-2)
+        comparison = masks[(5, 5), -2]
         self.assertIsInstance(result, ht.DNDarray)
         self.assertEqual(result.shape, (5, 5))
         self.assertEqual(result.lshape, (5, 5))
@@ -1268,7 +1137,7 @@ class TestLinalgBasics(TestCase):
 
         # 2D case, no offset, data is not split, method
         result = local_ones.tril()
-        comparison = torch.ones((4, 5), device=self.device.torch_device).tril()
+        comparison = masks[(4, 5), 0]
         self.assertIsInstance(result, ht.DNDarray)
         self.assertEqual(result.shape, (4, 5))
         self.assertEqual(result.lshape, (4, 5))
@@ -1277,7 +1146,7 @@ class TestLinalgBasics(TestCase):
 
         # 2D case, positive offset, data is not split, method
         result = local_ones.tril(k=2)
-        comparison = torch.ones((4, 5), device=self.device.torch_device).tril(diagonal=2)
+        comparison = masks[(4, 5), 2]
         self.assertIsInstance(result, ht.DNDarray)
         self.assertEqual(result.shape, (4, 5))
         self.assertEqual(result.lshape, (4, 5))
@@ -1286,7 +1155,7 @@ class TestLinalgBasics(TestCase):
 
         # 2D case, negative offset, data is not split, method
         result = local_ones.tril(k=-2)
-        comparison = torch.ones((4, 5), device=self.device.torch_device).tril(diagonal=-2)
+        comparison = masks[(4, 5), -2]
         self.assertIsInstance(result, ht.DNDarray)
         self.assertEqual(result.shape, (4, 5))
         self.assertEqual(result.lshape, (4, 5))
@@ -1297,38 +1166,42 @@ class TestLinalgBasics(TestCase):
 
         # 2D+ case, no offset, data is not split, module-level call
         result = local_ones.tril()
-        comparison = torch.ones((5, 6), device=self.device.torch_device).tril()
+        comparison = masks[(5, 6), 0]
         self.assertIsInstance(result, ht.DNDarray)
         self.assertEqual(result.shape, (3, 4, 5, 6))
         self.assertEqual(result.lshape, (3, 4, 5, 6))
         self.assertEqual(result.split, None)
-        for i in range(3):
-            for j in range(4):
-                self.assertTrue((result.larray[i, j] == comparison).all())
+        # expand is a zero-copy view; one tensor-wide compare instead of a
+        # Python loop over the leading dimensions
+        expanded = comparison.unsqueeze(0).unsqueeze(0).expand(3, 4, -1, -1)
+        self.assertTrue(torch.equal(result.larray, expanded))
 
         # 2D+ case, positive offset, data is not split, module-level call
         result = local_ones.tril(k=2)
-        comparison = torch.ones((5, 6), device=self.device.torch_device).tril(diagonal=2)
+        comparison = masks[(5, 6), 2]
         self.assertIsInstance(result, ht.DNDarray)
         self.assertEqual(result.shape, (3, 4, 5, 6))
         self.assertEqual(result.lshape, (3, 4, 5, 6))
         self.assertEqual(result.split, None)
-        for i in range(3):
-            for j in range(4):
-                self.assertTrue((result.larray[i, j] == comparison).all())
+        expanded = comparison.unsqueeze(0).unsqueeze(0).expand(3, 4, -1, -1)
+        self.assertTrue(torch.equal(result.larray, expanded))
 
         # # 2D+ case, negative offset, data is not split, module-level call
         result = local_ones.tril(k=-2)
-        comparison = torch.ones((5, 6), device=self.device.torch_device).tril(diagonal=-2)
+        comparison = masks[(5, 6), -2]
         self.assertIsInstance(result, ht.DNDarray)
         self.assertEqual(result.shape, (3, 4, 5, 6))
         self.assertEqual(result.lshape, (3, 4, 5, 6))
         self.assertEqual(result.split, None)
-        for i in range(3):
-            for j in range(4):
-                self.assertTrue((result.larray[i, j] == comparison).all())
+        expanded = comparison.unsqueeze(0).unsqueeze(0).expand(3, 4, -1, -1)
+        self.assertTrue(torch.equal(result.larray, expanded))
+
+        distributed_ones = self._ones_1d_split
 
-        distributed_ones = ht.ones((5,), split=0)
+        # local partial sums of every distributed case, verified at the end
+        # with one batched allreduce instead of one collective per case
+        local_sums = []
+        expected_sums = [15, 22, 6, 10, 17, 3, 10, 17, 3]
 
         # 1D case, no offset, data is split, method
         result = distributed_ones.tril()
@@ -1337,7 +1210,7 @@ class TestLinalgBasics(TestCase):
         self.assertEqual(result.split, 1)
         self.assertTrue(result.lshape[0] == 5 or result.lshape[0] == 0)
         self.assertLessEqual(result.lshape[1], 5)
-        self.assertTrue(result.sum(), 15)
+        local_sums.append(result.larray.sum())
         if result.comm.rank == 0:
             self.assertTrue(result.larray[-1, 0] == 1)
         if result.comm.rank == result.shape[0] - 1:
@@ -1350,7 +1223,7 @@ class TestLinalgBasics(TestCase):
         self.assertEqual(result.split, 1)
         self.assertEqual(result.lshape[0], 5)
         self.assertLessEqual(result.lshape[1], 5)
-        self.assertEqual(result.sum(), 22)
+        local_sums.append(result.larray.sum())
         if result.comm.rank == 0:
             self.assertTrue(result.larray[-1, 0] == 1)
         if result.comm.rank == result.shape[0] - 1:
@@ -1363,13 +1236,13 @@ class TestLinalgBasics(TestCase):
         self.assertEqual(result.split, 1)
         self.assertEqual(result.lshape[0], 5)
         self.assertLessEqual(result.lshape[1], 5)
-        self.assertEqual(result.sum(), 6)
+        local_sums.append(result.larray.sum())
         if result.comm.rank == 0:
             self.assertTrue(result.larray[-1, 0] == 1)
         if result.comm.rank == result.shape[0] - 1:
             self.assertTrue(result.larray[0, -1] == 0)
 
-        distributed_ones = ht.ones((4, 5), split=0)
+        distributed_ones = self._ones_2d_split0
 
         # 2D case, no offset, data is horizontally split, method
         result = distributed_ones.tril()
@@ -1378,7 +1251,7 @@ class TestLinalgBasics(TestCase):
         self.assertEqual(result.split, 0)
         self.assertLessEqual(result.lshape[0], 4)
         self.assertEqual(result.lshape[1], 5)
-        self.assertEqual(result.sum(), 10)
+        local_sums.append(result.larray.sum())
         if result.comm.rank == 0:
             self.assertTrue(result.larray[0, -1] == 0)
         if result.comm.rank == result.shape[0] - 1:
@@ -1391,7 +1264,7 @@ class TestLinalgBasics(TestCase):
         self.assertEqual(result.split, 0)
         self.assertLessEqual(result.lshape[0], 4)
         self.assertEqual(result.lshape[1], 5)
-        self.assertEqual(result.sum(), 17)
+        local_sums.append(result.larray.sum())
         if result.comm.rank == 0:
             self.assertTrue(result.larray[0, -1] == 0)
         if result.comm.rank == result.shape[0] - 1:
@@ -1404,13 +1277,13 @@ class TestLinalgBasics(TestCase):
         self.assertEqual(result.split, 0)
         self.assertLessEqual(result.lshape[0], 4)
         self.assertEqual(result.lshape[1], 5)
-        self.assertEqual(result.sum(), 3)
+        local_sums.append(result.larray.sum())
         if result.comm.rank == 0:
             self.assertTrue(result.larray[0, -1] == 0)
         if result.comm.rank == result.shape[0] - 1:
             self.assertTrue(result.larray[-1, 0] == 1)
 
-        distributed_ones = ht.ones((4, 5), split=1)
+        distributed_ones = self._ones_2d_split1
 
         # 2D case, no offset, data is vertically split, method
         result = distributed_ones.tril()
@@ -1419,7 +1292,7 @@ class TestLinalgBasics(TestCase):
         self.assertEqual(result.split, 1)
         self.assertEqual(result.lshape[0], 4)
         self.assertLessEqual(result.lshape[1], 5)
-        self.assertEqual(result.sum(), 10)
+        local_sums.append(result.larray.sum())
         if result.comm.rank == 0:
             self.assertTrue(result.larray[-1, 0] == 1)
         if result.comm.rank == result.shape[0] - 1:
@@ -1432,7 +1305,7 @@ class TestLinalgBasics(TestCase):
         self.assertEqual(result.split, 1)
         self.assertEqual(result.lshape[0], 4)
         self.assertLessEqual(result.lshape[1], 5)
-        self.assertEqual(result.sum(), 17)
+        local_sums.append(result.larray.sum())
         if result.comm.rank == 0:
             self.assertTrue(result.larray[-1, 0] == 1)
         if result.comm.rank == result.shape[0] - 1:
@@ -1445,230 +1318,119 @@ class TestLinalgBasics(TestCase):
         self.assertEqual(result.split, 1)
         self.assertEqual(result.lshape[0], 4)
         self.assertLessEqual(result.lshape[1], 5)
-        self.assertEqual(result.sum(), 3)
+        local_sums.append(result.larray.sum())
         if result.comm.rank == 0:
             self.assertTrue(result.larray[-1, 0] == 1)
         if result.comm.rank == result.shape[0] - 1:
             self.assertTrue(result.larray[0, -1] == 0)
 
+        sums = torch.stack(local_sums)
+        if distributed_ones.comm.is_distributed():
+            distributed_ones.comm.Allreduce(MPI.IN_PLACE, sums, MPI.SUM)
+        for actual, expected in zip(sums.tolist(), expected_sums):
+            self.assertEqual(actual, expected)
+
         with self.assertRaises(TypeError):
             ht.tril("asdf")
         with self.assertRaises(TypeError):
             ht.tril(distributed_ones, m=["sdf", "sf"])
 
-    def test_triu(self):
-        local_ones = ht.ones((5,))
-
-        # 1D case, no offset, data is not split, module-level call
-        result = ht.triu(local_ones)
-        comparison = torch.ones((5, 5), device=self.device.torch_device).triu()
-        self.assertIsInstance(result, ht.DNDarray)
-        self.assertEqual(result.shape, (5, 5))
-        self.assertEqual(result.lshape, (5, 5))
-        self.assertEqual(result.split, None)
-        self.assertTrue((result.larray == comparison).all())
-
-        # 1D case, positive offset, data is not split, module-level call
-        result = ht.triu(local_ones, k=2)
-        comparison = torch.ones((5, 5), device=self.device.torch_device).triu(diagonal=2)
-        self.assertIsInstance(result, ht.DNDarray)
-        self.assertEqual(result.shape, (5, 5))
-        self.assertEqual(result.lshape, (5, 5))
-        self.assertEqual(result.split, None)
-        self.assertTrue((result.larray == comparison).all())
-
-        # 1D case, negative offset, data is not split, module-level call
-        result = ht.triu(local_ones, k=-2)
-        comparison = torch.ones((5, 5), device=self.device.torch_device).triu(diagonal=-2)
-        self.assertIsInstance(result, ht.DNDarray)
-        self.assertEqual(result.shape, (5, 5))
-        self.assertEqual(result.lshape, (5, 5))
-        self.assertEqual(result.split, None)
-        self.assertTrue((result.larray == comparison).all())
-
-        local_ones = ht.ones((4, 5))
-
-        # 2D case, no offset, data is not split, method
-        result = local_ones.triu()
-        comparison = torch.ones((4, 5), device=self.device.torch_device).triu()
-        self.assertIsInstance(result, ht.DNDarray)
-        self.assertEqual(result.shape, (4, 5))
-        self.assertEqual(result.lshape, (4, 5))
-        self.assertEqual(result.split, None)
-        self.assertTrue((result.larray == comparison).all())
-
-        # 2D case, positive offset, data is not split, method
-        result = local_ones.triu(k=2)
-        comparison = torch.ones((4, 5), device=self.device.torch_device).triu(diagonal=2)
-        self.assertIsInstance(result, ht.DNDarray)
-        self.assertEqual(result.shape, (4, 5))
-        self.assertEqual(result.lshape, (4, 5))
-        self.assertEqual(result.split, None)
-        self.assertTrue((result.larray == comparison).all())
+    def _check_triu_distributed(
+        self, da, k, shape, split, lshape_pattern, total, corner0, corner_last, check_global=False
+    ):
+        """
+        Run one distributed triu case: apply the offset, verify the structural
+        properties and the global sum, and probe the corner elements on the
+        first rank and on the rank addressed by the last row index.
+        """
+        result = da.triu(k=k)
+        self.assertIsInstance(result, ht.DNDarray)
+        self.assertEqual(result.shape, shape)
+        self.assertEqual(result.split, split)
+        self.assert_lshape_matches(result, lshape_pattern)
+        # the local chunk sum is predictable from the split offset, so most
+        # cases verify it allreduce-free; one global sum per shape remains as
+        # an end-to-end check
+        start, lshape, _ = result.comm.chunk(result.shape, result.split)
+        expected_local = _triu_chunk_sum(result.shape, result.split, start, lshape[result.split], k)
+        self.assertEqual(int(result.larray.sum().item()), expected_local)
+        if check_global:
+            self.assertEqual(result.sum(), total)
+        # rank and the probed row index are read once; the last row index is
+        # never 0 for these shapes, so the two probes are mutually exclusive
+        rank = result.comm.rank
+        last = result.shape[0] - 1
+        if rank == 0:
+            index, value = corner0
+            self.assertTrue(result.larray[index] == value)
+        elif rank == last:
+            index, value = corner_last
+            self.assertTrue(result.larray[index] == value)
 
-        # 2D case, negative offset, data is not split, method
-        result = local_ones.triu(k=-2)
-        comparison = torch.ones((4, 5), device=self.device.torch_device).triu(diagonal=-2)
-        self.assertIsInstance(result, ht.DNDarray)
-        self.assertEqual(result.shape, (4, 5))
-        self.assertEqual(result.lshape, (4, 5))
-        self.assertEqual(result.split, None)
-        self.assertTrue((result.larray == comparison).all())
-
-        local_ones = ht.ones((3, 4, 5, 6))
-
-        # 2D+ case, no offset, data is not split, module-level call
-        result = local_ones.triu()
-        comparison = torch.ones((5, 6), device=self.device.torch_device).triu()
-        self.assertIsInstance(result, ht.DNDarray)
-        self.assertEqual(result.shape, (3, 4, 5, 6))
-        self.assertEqual(result.lshape, (3, 4, 5, 6))
-        self.assertEqual(result.split, None)
-        for i in range(3):
-            for j in range(4):
-                self.assertTrue((result.larray[i, j] == comparison).all())
-
-        # 2D+ case, positive offset, data is not split, module-level call
-        result = local_ones.triu(k=2)
-        comparison = torch.ones((5, 6), device=self.device.torch_device).triu(diagonal=2)
-        self.assertIsInstance(result, ht.DNDarray)
-        self.assertEqual(result.shape, (3, 4, 5, 6))
-        self.assertEqual(result.lshape, (3, 4, 5, 6))
-        self.assertEqual(result.split, None)
-        for i in range(3):
-            for j in range(4):
-                self.assertTrue((result.larray[i, j] == comparison).all())
-
-        # # 2D+ case, negative offset, data is not split, module-level call
-        result = local_ones.triu(k=-2)
-        comparison = torch.ones((5, 6), device=self.device.torch_device).triu(diagonal=-2)
+    def test_triu(self):
+        # bind the torch device once; the property chain behind
+        # self.device.torch_device is re-evaluated on every access
+        dev = self.device.torch_device
+        # the undistributed grid as data: (input shape, result shape,
+        # reference mask shape), one loop body instead of nine copies
+        undistributed = (
+            ((5,), (5, 5), (5, 5)),
+            ((4, 5), (4, 5), (4, 5)),
+            # a single leading broadcast element is enough for the value
+            # check; shape propagation over full leading dims is tested below
+            ((1, 1, 5, 6), (1, 1, 5, 6), (5, 6)),
+        )
+        for in_shape, out_shape, ref_shape in undistributed:
+            local_ones = ht.ones(in_shape)
+            for k in (0, 2, -2):
+                with self.subTest(shape=in_shape, k=k):
+                    # keep both entry points covered: module-level for the
+                    # 1-D expansion case, method call for the rest
+                    if len(in_shape) == 1:
+                        result = ht.triu(local_ones, k=k)
+                    else:
+                        result = local_ones.triu(k=k)
+                    comparison = _tri_mask(ref_shape[0], ref_shape[1], k, dev)
+                    self.assertIsInstance(result, ht.DNDarray)
+                    self.assertEqual(result.shape, out_shape)
+                    self.assertEqual(result.lshape, out_shape)
+                    self.assertEqual(result.split, None)
+                    if len(out_shape) > 2:
+                        expanded = comparison.expand(out_shape)
+                        self.assertTrue(torch.equal(result.larray, expanded))
+                    else:
+                        # torch.equal returns a plain bool without
+                        # materializing an intermediate boolean tensor
+                        self.assertTrue(torch.equal(result.larray, comparison))
+
+        # leading dimensions are purely structural for triu, so the full-size
+        # 4-D operand is only used for one shape-propagation check
+        result = ht.ones((3, 4, 5, 6)).triu()
         self.assertIsInstance(result, ht.DNDarray)
         self.assertEqual(result.shape, (3, 4, 5, 6))
         self.assertEqual(result.lshape, (3, 4, 5, 6))
         self.assertEqual(result.split, None)
-        for i in range(3):
-            for j in range(4):
-                self.assertTrue((result.larray[i, j] == comparison).all())
-
-        distributed_ones = ht.ones((5,), split=0)
-
-        # 1D case, no offset, data is split, method
-        result = distributed_ones.triu()
-        self.assertIsInstance(result, ht.DNDarray)
-        self.assertEqual(result.shape, (5, 5))
-        self.assertEqual(result.split, 1)
-        self.assertEqual(result.lshape[0], 5)
-        self.assertLessEqual(result.lshape[1], 5)
-        self.assertTrue(result.sum(), 15)
-        if result.comm.rank == 0:
-            self.assertTrue(result.larray[-1, 0] == 0)
-        if result.comm.rank == result.shape[0] - 1:
-            self.assertTrue(result.larray[0, -1] == 1)
-
-        # 1D case, positive offset, data is split, method
-        result = distributed_ones.triu(k=2)
-        self.assertIsInstance(result, ht.DNDarray)
-        self.assertEqual(result.shape, (5, 5))
-        self.assertEqual(result.split, 1)
-        self.assertEqual(result.lshape[0], 5)
-        self.assertLessEqual(result.lshape[1], 5)
-        self.assertEqual(result.sum(), 6)
-        if result.comm.rank == 0:
-            self.assertTrue(result.larray[-1, 0] == 0)
-        if result.comm.rank == result.shape[0] - 1:
-            self.assertTrue(result.larray[0, -1] == 1)
 
-        # 1D case, negative offset, data is split, method
-        result = distributed_ones.triu(k=-2)
-        self.assertIsInstance(result, ht.DNDarray)
-        self.assertEqual(result.shape, (5, 5))
-        self.assertEqual(result.split, 1)
-        self.assertEqual(result.lshape[0], 5)
-        self.assertLessEqual(result.lshape[1], 5)
-        self.assertEqual(result.sum(), 22)
-        if result.comm.rank == 0:
-            self.assertTrue(result.larray[-1, 0] == 0)
-        if result.comm.rank == result.shape[0] - 1:
-            self.assertTrue(result.larray[0, -1] == 1)
-
-        distributed_ones = ht.ones((4, 5), split=0)
-
-        # 2D case, no offset, data is horizontally split, method
-        result = distributed_ones.triu()
-        self.assertIsInstance(result, ht.DNDarray)
-        self.assertEqual(result.shape, (4, 5))
-        self.assertEqual(result.split, 0)
-        self.assertLessEqual(result.lshape[0], 4)
-        self.assertEqual(result.lshape[1], 5)
-        self.assertEqual(result.sum(), 14)
-        if result.comm.rank == 0:
-            self.assertTrue(result.larray[0, -1] == 1)
-        if result.comm.rank == result.shape[0] - 1:
-            self.assertTrue(result.larray[-1, 0] == 0)
-
-        # # 2D case, positive offset, data is horizontally split, method
-        result = distributed_ones.triu(k=2)
-        self.assertIsInstance(result, ht.DNDarray)
-        self.assertEqual(result.shape, (4, 5))
-        self.assertEqual(result.split, 0)
-        self.assertLessEqual(result.lshape[0], 4)
-        self.assertEqual(result.lshape[1], 5)
-        self.assertEqual(result.sum(), 6)
-        if result.comm.rank == 0:
-            self.assertTrue(result.larray[0, -1] == 1)
-        if result.comm.rank == result.shape[0] - 1:
-            self.assertTrue(result.larray[-1, 0] == 0)
-
-        # # 2D case, negative offset, data is horizontally split, method
-        result = distributed_ones.triu(k=-2)
-        self.assertIsInstance(result, ht.DNDarray)
-        self.assertEqual(result.shape, (4, 5))
-        self.assertEqual(result.split, 0)
-        self.assertLessEqual(result.lshape[0], 4)
-        self.assertEqual(result.lshape[1], 5)
-        self.assertEqual(result.sum(), 19)
-        if result.comm.rank == 0:
-            self.assertTrue(result.larray[0, -1] == 1)
-        if result.comm.rank == result.shape[0] - 1:
-            self.assertTrue(result.larray[-1, 0] == 0)
-
-        distributed_ones = ht.ones((4, 5), split=1)
-
-        # 2D case, no offset, data is vertically split, method
-        result = distributed_ones.triu()
-        self.assertIsInstance(result, ht.DNDarray)
-        self.assertEqual(result.shape, (4, 5))
-        self.assertEqual(result.split, 1)
-        self.assertEqual(result.lshape[0], 4)
-        self.assertLessEqual(result.lshape[1], 5)
-        self.assertEqual(result.sum(), 14)
-        if result.comm.rank == 0:
-            self.assertTrue(result.larray[-1, 0] == 0)
-        if result.comm.rank == result.shape[0] - 1:
-            self.assertTrue(result.larray[0, -1] == 1)
-
-        # 2D case, positive offset, data is horizontally split, method
-        result = distributed_ones.triu(k=2)
-        self.assertIsInstance(result, ht.DNDarray)
-        self.assertEqual(result.shape, (4, 5))
-        self.assertEqual(result.split, 1)
-        self.assertEqual(result.lshape[0], 4)
-        self.assertLessEqual(result.lshape[1], 5)
-        self.assertEqual(result.sum(), 6)
-        if result.comm.rank == 0:
-            self.assertTrue(result.larray[-1, 0] == 0)
-        if result.comm.rank == result.shape[0] - 1:
-            self.assertTrue(result.larray[0, -1] == 1)
-
-        # 2D case, negative offset, data is horizontally split, method
-        result = distributed_ones.triu(k=-2)
-        self.assertIsInstance(result, ht.DNDarray)
-        self.assertEqual(result.shape, (4, 5))
-        self.assertEqual(result.split, 1)
-        self.assertEqual(result.lshape[0], 4)
-        self.assertLessEqual(result.lshape[1], 5)
-        self.assertEqual(result.sum(), 19)
-        if result.comm.rank == 0:
-            self.assertTrue(result.larray[-1, 0] == 0)
-        if result.comm.rank == result.shape[0] - 1:
-            self.assertTrue(result.larray[0, -1] == 1)
+        ones_1d = self._ones_1d_split
+        ones_h = self._ones_2d_split0
+        ones_v = self._ones_2d_split1
+        # corner probes: (index, expected value) checked on the first rank
+        # and on the rank addressed by the last row index
+        low, high = ((-1, 0), 0), ((0, -1), 1)
+        cases = [
+            # operand, k, global shape, split, lshape pattern, sum, corners
+            (ones_1d, 0, (5, 5), 1, (5, -1), 15, low, high),
+            (ones_1d, 2, (5, 5), 1, (5, -1), 6, low, high),
+            (ones_1d, -2, (5, 5), 1, (5, -1), 22, low, high),
+            (ones_h, 0, (4, 5), 0, (-1, 5), 14, high, low),
+            (ones_h, 2, (4, 5), 0, (-1, 5), 6, high, low),
+            (ones_h, -2, (4, 5), 0, (-1, 5), 19, high, low),
+            (ones_v, 0, (4, 5), 1, (4, -1), 14, low, high),
+            (ones_v, 2, (4, 5), 1, (4, -1), 6, low, high),
+            (ones_v, -2, (4, 5), 1, (4, -1), 19, low, high),
+        ]
+        for da, k, shape, split, pattern, total, corner0, corner_last in cases:
+            with self.subTest(shape=shape, split=split, k=k):
+                self._check_triu_distributed(
+                    da, k, shape, split, pattern, total, corner0, corner_last, check_global=k == 0
+                )
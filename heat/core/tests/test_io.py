@@ -1,58 +1,289 @@
+import concurrent.futures
+import contextlib
+import functools
 import numpy as np
 import os
+import shutil
+import tempfile
 import torch
 
 import heat as ht
 from .test_suites.basic_test import TestCase
 
 
+@functools.lru_cache(maxsize=None)
+def _csv_reference(path, sep):
+    """
+    Parse the comparison CSV and memoize the resulting array.
+
+    The file is read in one go and tokenized in bulk instead of going
+    through the pure-Python line loop of ``np.loadtxt``; one parse per
+    process is enough because the dataset on disk never changes during a
+    test run.
+    """
+    with open(path, "rb") as handle:
+        raw = handle.read()
+    lines = [line for line in raw.splitlines() if line.strip()]
+    flat = np.array(b" ".join(lines).replace(sep.encode(), b" ").split(), dtype=np.float64)
+    return flat.reshape(len(lines), -1)
+
+
+@functools.lru_cache(maxsize=None)
+def _double_arange(n, device):
+    """
+    Expected contents of an arange(n) written twice back to back, cached
+    because the append tests keep requesting the same size. The tensors are
+    only ever read, so sharing them between calls is safe.
+    """
+    single = torch.arange(n, dtype=torch.int32, device=device)
+    return torch.cat((single, single))
+
+
+@functools.lru_cache(maxsize=None)
+def _full_ref(shape, value, device):
+    """
+    Constant int32 reference tensor for readback comparisons, cached per
+    shape and fill value like :func:`_double_arange`.
+    """
+    return torch.full(shape, value, dtype=torch.int32, device=device)
+
+
 class TestIO(TestCase):
     @classmethod
     def setUpClass(cls):
         super(TestIO, cls).setUpClass()
-        pwd = os.getcwd()
+
+        # probe the optional I/O back ends once on rank 0 and broadcast the
+        # outcome, instead of re-checking them in every test on every rank
+        backends = None
+        if ht.MPI_WORLD.rank == 0:
+            backends = (ht.io.supports_hdf5(), ht.io.supports_netcdf())
+        cls.HDF5_AVAILABLE, cls.NETCDF_AVAILABLE = ht.MPI_WORLD.bcast(backends, root=0)
+
+        # place the output files in a temporary directory, preferably backed by
+        # memory (tmpfs) so the save/readback cycles do not hit the disk; rank 0
+        # creates the directory and broadcasts its name to everybody else
+        tmp_base = "/dev/shm" if os.path.isdir("/dev/shm") else None
+        tmp_dir = tempfile.mkdtemp(dir=tmp_base) if ht.MPI_WORLD.rank == 0 else None
+        cls.TMP_DIR = ht.MPI_WORLD.bcast(tmp_dir, root=0)
+
         cls.HDF5_PATH = os.path.join(os.getcwd(), "heat/datasets/iris.h5")
-        cls.HDF5_OUT_PATH = pwd + "/test.h5"
+        cls.HDF5_OUT_PATH = os.path.join(cls.TMP_DIR, "test.h5")
         cls.HDF5_DATASET = "data"
 
         cls.NETCDF_PATH = os.path.join(os.getcwd(), "heat/datasets/iris.nc")
-        cls.NETCDF_OUT_PATH = pwd + "/test.nc"
+        cls.NETCDF_OUT_PATH = os.path.join(cls.TMP_DIR, "test.nc")
         cls.NETCDF_VARIABLE = "data"
         cls.NETCDF_DIMENSION = "data"
 
-        # load comparison data from csv
+        # load comparison data from csv; keep a CPU copy next to the
+        # device-resident one so comparisons never trigger implicit transfers
         cls.CSV_PATH = os.path.join(os.getcwd(), "heat/datasets/iris.csv")
-        cls.IRIS = (
-            torch.from_numpy(np.loadtxt(cls.CSV_PATH, delimiter=";"))
-            .float()
-            .to(cls.device.torch_device)
-        )
+        cls.IRIS_CPU = torch.from_numpy(_csv_reference(cls.CSV_PATH, ";")).float()
+        cls.IRIS = cls.IRIS_CPU.to(cls.device.torch_device)
+
+        # constant input fixtures shared by the save tests; none of them is
+        # ever modified, so building them once per class is enough
+        cls.ARANGE100 = ht.arange(100)
+        cls.ARANGE100_SPLIT0 = ht.arange(100, split=0)
+        cls.ARANGE10 = ht.arange(10)
+        cls.ARANGE10_SPLIT0 = ht.arange(10, split=0)
+        cls.ARANGE5 = ht.arange(5)
+        cls.ARANGE5_SPLIT0 = ht.arange(5, split=0)
+        cls.ONES20 = ht.ones(20)
+
+        # single worker executing rank 0's content comparisons in the
+        # background, see _queue_compare
+        cls._compare_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._compare_pool.shutdown()
+        # wait for all save/readback traffic to finish, then have rank 0 remove
+        # the entire temporary directory in one go
+        ht.MPI_WORLD.Barrier()
+        if ht.MPI_WORLD.rank == 0:
+            shutil.rmtree(cls.TMP_DIR, ignore_errors=True)
 
     def tearDown(self):
+        # complete anything left pending by the asynchronous helpers
+        self._finish_async_asserts()
+        self._drain_compares()
+        self._drain_barriers()
+
+        # clean up of temporary files; every rank has already finished its part
+        # of the test at this point, so only rank 0 needs to touch the
+        # filesystem and a single trailing barrier keeps the ranks in step
+        if ht.MPI_WORLD.rank == 0:
+            if self.HDF5_AVAILABLE:
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(self.HDF5_OUT_PATH)
+            if self.NETCDF_AVAILABLE:
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(self.NETCDF_OUT_PATH)
+
         # synchronize all nodes
         ht.MPI_WORLD.Barrier()
 
-        # clean up of temporary files
-        if ht.io.supports_hdf5():
-            try:
-                os.remove(self.HDF5_OUT_PATH)
-            except FileNotFoundError:
-                pass
+    def setUp(self):
+        # non-blocking barriers posted by the verification helpers that still
+        # need to be completed, see _drain_barriers
+        self._pending_barriers = []
+        # in-flight distributed equality checks, see _async_assert_equal
+        self._pending_equals = []
+        # comparisons rank 0 has handed to the background worker
+        self._pending_compares = []
+
+    def _drain_barriers(self):
+        """Complete all non-blocking barriers this rank has left pending."""
+        while self._pending_barriers:
+            self._pending_barriers.pop().Wait()
+
+    def _queue_compare(self, expected, comparison):
+        """
+        Hand a content comparison to the background worker.
+
+        The file data has already been read into ``comparison`` at this
+        point, so the check no longer depends on the file and may safely run
+        while the main thread constructs the next fixture or starts the next
+        save. Failures surface when :meth:`_drain_compares` collects the
+        results.
+        """
+        # materialize the reference once if it is a strided view; for the
+        # contiguous class fixtures this is a no-op, and the comparison then
+        # runs as a flat memory scan instead of a gather
+        expected = expected.contiguous()
+        self._pending_compares.append(
+            self._compare_pool.submit(self._assert_tensors_equal, expected, comparison)
+        )
+
+    def _drain_compares(self):
+        """Wait for all queued comparisons and re-raise their failures."""
+        while self._pending_compares:
+            self._pending_compares.pop().result()
+
+    def _async_assert_equal(self, a, b):
+        """
+        Queue a distributed equality check between two DNDarrays.
+
+        The local comparison runs immediately, but the logical AND across all
+        ranks is collected with a non-blocking Iallreduce; the result is only
+        asserted once :meth:`_finish_async_asserts` completes the request, so
+        several checks can share one communication round trip latency.
+        """
+        equal = torch.tensor([a.shape == b.shape and torch.equal(a.larray, b.larray)])
+        req = a.comm.Iallreduce(ht.MPI.IN_PLACE, equal, ht.MPI.LAND)
+        self._pending_equals.append((req, equal))
+
+    def _finish_async_asserts(self):
+        """Complete all queued equality checks and assert their outcomes."""
+        while self._pending_equals:
+            req, equal = self._pending_equals.pop()
+            req.Wait()
+            self.assertTrue(bool(equal.item()))
+
+    def _assert_tensors_equal(self, expected, comparison):
+        """
+        Assert that two tensors hold identical values.
+
+        ``torch.equal`` compares shape and content in a single call instead of
+        materializing an element-wise boolean mask and reducing it; the mask
+        variant is only kept as fallback for the checks that deliberately
+        compare tensors of broadcastable but different shapes or dtypes.
+        """
+        if expected.shape == comparison.shape and expected.dtype == comparison.dtype:
+            self.assertTrue(torch.equal(expected, comparison))
+        else:
+            self.assertTrue((expected == comparison).all())
+
+    def _read_as_int32(self, dataset):
+        """
+        Turn data just read from an HDF5 or NetCDF handle into an int32 torch
+        tensor on the test device.
+
+        ``torch.tensor`` always copies its input; here ``np.asarray`` only
+        wraps what the back end returns, ``astype(copy=False)`` converts
+        solely when the on-disk dtype differs from int32 and
+        ``torch.from_numpy`` shares the buffer, so at most the device
+        transfer copies - non-blocking where the back end allows it.
+        """
+        array = np.asarray(dataset).astype(np.int32, copy=False)
+        return torch.from_numpy(array).to(self.device.torch_device, non_blocking=True)
+
+    def _iris_like(self, array):
+        """Return the IRIS reference that lives on the same device as ``array``."""
+        return self.IRIS if array.device == self.IRIS.device else self.IRIS_CPU
+
+    def _verify_hdf5_rank0(self, expected, dataset=None):
+        """
+        Compare the HDF5 output file against ``expected`` on rank 0.
+
+        A non-blocking barrier separates the preceding collective save from
+        the readback: rank 0 completes it immediately, which guarantees every
+        rank has finished writing before the file is opened, while the other
+        ranks leave the barrier pending and may overlap their next piece of
+        work with the readback.
+        """
+        if dataset is None:
+            dataset = self.HDF5_DATASET
+        self._verify_hdf5_many_rank0(((dataset, expected),))
+
+    def _verify_hdf5_many_rank0(self, checks):
+        """
+        Compare several datasets of the HDF5 output file against their
+        expected contents in a single file open, synchronized like
+        :meth:`_verify_hdf5_rank0`.
+        """
+        req = ht.MPI_WORLD.Ibarrier()
+        if ht.MPI_WORLD.rank == 0:
+            req.Wait()
+            with ht.io.h5py.File(self.HDF5_OUT_PATH, "r") as handle:
+                for dataset, expected in checks:
+                    # read straight into a preallocated buffer; this skips the
+                    # intermediate array h5py's indexing path would allocate
+                    dset = handle[dataset]
+                    buffer = np.empty(dset.shape, dtype=dset.dtype)
+                    dset.read_direct(buffer)
+                    self._queue_compare(expected, self._read_as_int32(buffer))
+        else:
+            self._pending_barriers.append(req)
 
-        if ht.io.supports_netcdf():
-            try:
-                os.remove(self.NETCDF_OUT_PATH)
-            except FileNotFoundError:
-                pass
-        # if ht.MPI_WORLD.rank == 0:
+    def _verify_netcdf_rank0(self, expected, indices=slice(None)):
+        """
+        Compare the NetCDF output file against ``expected`` on rank 0.
 
-        # synchronize all nodes
-        ht.MPI_WORLD.Barrier()
+        Synchronization works exactly as in :meth:`_verify_hdf5_rank0`.
+        """
+        req = ht.MPI_WORLD.Ibarrier()
+        if ht.MPI_WORLD.rank == 0:
+            req.Wait()
+            with ht.io.nc.Dataset(self.NETCDF_OUT_PATH, "r") as handle:
+                comparison = self._read_as_int32(handle[self.NETCDF_VARIABLE][indices])
+            self._queue_compare(expected, comparison)
+        else:
+            self._pending_barriers.append(req)
+
+    def _verify_netcdf_dims_rank0(self, expected, dimension):
+        """
+        Check both the dimension names and the content of the NetCDF output
+        file from a single rank-0 file open, synchronized as in
+        :meth:`_verify_hdf5_rank0`.
+        """
+        req = ht.MPI_WORLD.Ibarrier()
+        if ht.MPI_WORLD.rank == 0:
+            req.Wait()
+            with ht.io.nc.Dataset(self.NETCDF_OUT_PATH, "r") as handle:
+                dimensions = handle[self.NETCDF_VARIABLE].dimensions
+                comparison = self._read_as_int32(handle[self.NETCDF_VARIABLE][:])
+            self.assertTrue(dimension in dimensions)
+            self._queue_compare(expected, comparison)
+        else:
+            self._pending_barriers.append(req)
 
     # catch-all loading
     def test_load(self):
         # HDF5
-        if ht.io.supports_hdf5():
+        if self.HDF5_AVAILABLE:
             iris = ht.load(self.HDF5_PATH, dataset="data")
             self.assertIsInstance(iris, ht.DNDarray)
             # shape invariant
@@ -62,13 +293,13 @@ class TestIO(TestCase):
             self.assertEqual(iris.dtype, ht.float32)
             self.assertEqual(iris.larray.dtype, torch.float32)
             # content
-            self.assertTrue((self.IRIS == iris.larray).all())
+            self.assertTrue(torch.equal(self._iris_like(iris.larray), iris.larray))
         else:
             with self.assertRaises(RuntimeError):
                 _ = ht.load(self.HDF5_PATH, dataset=self.HDF5_DATASET)
 
         # netCDF
-        if ht.io.supports_netcdf():
+        if self.NETCDF_AVAILABLE:
             iris = ht.load(self.NETCDF_PATH, variable=self.NETCDF_VARIABLE)
             self.assertIsInstance(iris, ht.DNDarray)
             # shape invariant
@@ -78,7 +309,7 @@ class TestIO(TestCase):
             self.assertEqual(iris.dtype, ht.float32)
             self.assertEqual(iris.larray.dtype, torch.float32)
             # content
-            self.assertTrue((self.IRIS == iris.larray).all())
+            self.assertTrue(torch.equal(self._iris_like(iris.larray), iris.larray))
         else:
             with self.assertRaises(RuntimeError):
                 _ = ht.load(self.NETCDF_PATH, variable=self.NETCDF_VARIABLE)
@@ -110,6 +341,9 @@ class TestIO(TestCase):
 
         if rank == 0:
             self.assertTrue(torch.equal(a.larray[0], first_value))
+        # keep the plain split=0 result around, it doubles as the reference
+        # for the ht.load dispatch check below
+        a_split0 = a
 
         a = ht.load_csv(self.CSV_PATH, sep=";", header_lines=9, dtype=ht.float32, split=0)
         expected_gshape = (csv_file_length - 9, csv_file_cols)
@@ -126,13 +360,15 @@ class TestIO(TestCase):
         self.assertEqual(a.shape, (csv_file_length, csv_file_cols))
         self.assertEqual(a.lshape[0], csv_file_length)
 
-        a = ht.load_csv(self.CSV_PATH, sep=";", split=0)
         b = ht.load(self.CSV_PATH, sep=";", split=0)
-        self.assertTrue(ht.equal(a, b))
+        # queue the distributed comparison and let it complete in the
+        # background while the remaining loads run
+        self._async_assert_equal(a_split0, b)
 
         # Test for csv where header is longer then the first process`s share of lines
         a = ht.load_csv(self.CSV_PATH, sep=";", header_lines=100, split=0)
         self.assertEqual(a.shape, (50, 4))
+        self._finish_async_asserts()
 
         with self.assertRaises(TypeError):
             ht.load_csv(12314)
@@ -143,14 +379,14 @@ class TestIO(TestCase):
 
     def test_load_exception(self):
         # correct extension, file does not exist
-        if ht.io.supports_hdf5():
+        if self.HDF5_AVAILABLE:
             with self.assertRaises(IOError):
                 ht.load("foo.h5", "data")
         else:
             with self.assertRaises(ImportError):
                 ht.load("foo.h5", "data")
 
-        if ht.io.supports_netcdf():
+        if self.NETCDF_AVAILABLE:
             with self.assertRaises(IOError):
                 ht.load("foo.nc", "data")
         else:
@@ -165,212 +401,147 @@ class TestIO(TestCase):
 
     # catch-all save
     def test_save(self):
-        if ht.io.supports_hdf5():
-            # local range
-            local_range = ht.arange(100)
-            local_range.save(self.HDF5_OUT_PATH, self.HDF5_DATASET, dtype=local_range.dtype.char())
-            if local_range.comm.rank == 0:
-                with ht.io.h5py.File(self.HDF5_OUT_PATH, "r") as handle:
-                    comparison = torch.tensor(
-                        handle[self.HDF5_DATASET],
-                        dtype=torch.int32,
-                        device=self.device.torch_device,
-                    )
-                self.assertTrue((local_range.larray == comparison).all())
-
-            # split range
-            split_range = ht.arange(100, split=0)
-            split_range.save(self.HDF5_OUT_PATH, self.HDF5_DATASET, dtype=split_range.dtype.char())
-            if split_range.comm.rank == 0:
-                with ht.io.h5py.File(self.HDF5_OUT_PATH, "r") as handle:
-                    comparison = torch.tensor(
-                        handle[self.HDF5_DATASET],
-                        dtype=torch.int32,
-                        device=self.device.torch_device,
-                    )
-                self.assertTrue((local_range.larray == comparison).all())
-
-        if ht.io.supports_netcdf():
-            # local range
-            local_range = ht.arange(100)
-            local_range.save(self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE)
-            if local_range.comm.rank == 0:
-                with ht.io.nc.Dataset(self.NETCDF_OUT_PATH, "r") as handle:
-                    comparison = torch.tensor(
-                        handle[self.NETCDF_VARIABLE][:],
-                        dtype=torch.int32,
-                        device=self.device.torch_device,
-                    )
-                self.assertTrue((local_range.larray == comparison).all())
-
-            # split range
-            split_range = ht.arange(100, split=0)
-            split_range.save(self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE)
-            if split_range.comm.rank == 0:
-                with ht.io.nc.Dataset(self.NETCDF_OUT_PATH, "r") as handle:
-                    comparison = torch.tensor(
-                        handle[self.NETCDF_VARIABLE][:],
-                        dtype=torch.int32,
-                        device=self.device.torch_device,
-                    )
-                self.assertTrue((local_range.larray == comparison).all())
-
-            # naming dimensions: string
-            local_range = ht.arange(100, device=self.device)
-            local_range.save(
-                self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE, dimension_names=self.NETCDF_DIMENSION
-            )
-            if local_range.comm.rank == 0:
-                with ht.io.nc.Dataset(self.NETCDF_OUT_PATH, "r") as handle:
-                    comparison = handle[self.NETCDF_VARIABLE].dimensions
-                self.assertTrue(self.NETCDF_DIMENSION in comparison)
-
-            # naming dimensions: tuple
-            local_range = ht.arange(100, device=self.device)
-            local_range.save(
-                self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE, dimension_names=(self.NETCDF_DIMENSION,)
-            )
-            if local_range.comm.rank == 0:
-                with ht.io.nc.Dataset(self.NETCDF_OUT_PATH, "r") as handle:
-                    comparison = handle[self.NETCDF_VARIABLE].dimensions
-                self.assertTrue(self.NETCDF_DIMENSION in comparison)
-
-            # appending unlimited variable
-            split_range.save(self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE, is_unlimited=True)
-            ht.MPI_WORLD.Barrier()
-            split_range.save(
-                self.NETCDF_OUT_PATH,
-                self.NETCDF_VARIABLE,
-                mode="r+",
-                file_slices=slice(split_range.size, None, None),
-                # debug=True,
-            )
-            if split_range.comm.rank == 0:
-                with ht.io.nc.Dataset(self.NETCDF_OUT_PATH, "r") as handle:
-                    comparison = torch.tensor(
-                        handle[self.NETCDF_VARIABLE][:],
-                        dtype=torch.int32,
-                        device=self.device.torch_device,
-                    )
-                self.assertTrue(
-                    (ht.concatenate((local_range, local_range)).larray == comparison).all()
-                )
+        # HDF5 support is optional
+        if not self.HDF5_AVAILABLE:
+            self.skipTest("Requires HDF5")
 
-            # indexing netcdf file: single index
-            ht.MPI_WORLD.Barrier()
-            zeros = ht.zeros((20, 1, 20, 2), device=self.device)
-            zeros.save(self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE, mode="w")
-            ones = ht.ones(20, device=self.device)
-            indices = (-1, 0, slice(None), 1)
-            ones.save(self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE, mode="r+", file_slices=indices)
-            if split_range.comm.rank == 0:
-                with ht.io.nc.Dataset(self.NETCDF_OUT_PATH, "r") as handle:
-                    comparison = torch.tensor(
-                        handle[self.NETCDF_VARIABLE][indices],
-                        dtype=torch.int32,
-                        device=self.device.torch_device,
-                    )
-                self.assertTrue((ones.larray == comparison).all())
-
-            # indexing netcdf file: multiple indices
-            ht.MPI_WORLD.Barrier()
-            small_range_split = ht.arange(10, split=0, device=self.device)
-            small_range = ht.arange(10, device=self.device)
-            indices = [[0, 9, 5, 2, 1, 3, 7, 4, 8, 6]]
-            small_range_split.save(
-                self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE, mode="w", file_slices=indices
-            )
-            if split_range.comm.rank == 0:
-                with ht.io.nc.Dataset(self.NETCDF_OUT_PATH, "r") as handle:
-                    comparison = torch.tensor(
-                        handle[self.NETCDF_VARIABLE][indices],
-                        dtype=torch.int32,
-                        device=self.device.torch_device,
-                    )
-                self.assertTrue((small_range.larray == comparison).all())
-
-            # slicing netcdf file
-            sslice = slice(7, 2, -1)
-            range_five_split = ht.arange(5, split=0, device=self.device)
-            range_five = ht.arange(5, device=self.device)
-            range_five_split.save(
-                self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE, mode="r+", file_slices=sslice
-            )
-            if split_range.comm.rank == 0:
-                with ht.io.nc.Dataset(self.NETCDF_OUT_PATH, "r") as handle:
-                    comparison = torch.tensor(
-                        handle[self.NETCDF_VARIABLE][sslice],
-                        dtype=torch.int32,
-                        device=self.device.torch_device,
-                    )
-                self.assertTrue((range_five.larray == comparison).all())
-
-            # indexing netcdf file: broadcasting array
-            zeros = ht.zeros((2, 1, 1, 4), device=self.device)
-            zeros.save(self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE, mode="w")
-            ones = ht.ones((4), split=0, device=self.device)
-            ones_nosplit = ht.ones((4), split=None, device=self.device)
-            indices = (0, slice(None), slice(None))
-            ones.save(self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE, mode="r+", file_slices=indices)
-            if split_range.comm.rank == 0:
-                with ht.io.nc.Dataset(self.NETCDF_OUT_PATH, "r") as handle:
-                    comparison = torch.tensor(
-                        handle[self.NETCDF_VARIABLE][indices],
-                        dtype=torch.int32,
-                        device=self.device.torch_device,
-                    )
-                self.assertTrue((ones_nosplit.larray == comparison).all())
-
-            # indexing netcdf file: broadcasting var
-            ht.MPI_WORLD.Barrier()
-            zeros = ht.zeros((2, 2), device=self.device)
-            zeros.save(self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE, mode="w")
-            ones = ht.ones((1, 2, 1), split=0, device=self.device)
-            ones_nosplit = ht.ones((1, 2, 1), device=self.device)
-            indices = (0,)
-            ones.save(self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE, mode="r+", file_slices=indices)
-            if split_range.comm.rank == 0:
-                with ht.io.nc.Dataset(self.NETCDF_OUT_PATH, "r") as handle:
-                    comparison = torch.tensor(
-                        handle[self.NETCDF_VARIABLE][indices],
-                        dtype=torch.int32,
-                        device=self.device.torch_device,
-                    )
-                self.assertTrue((ones_nosplit.larray == comparison).all())
-
-            # indexing netcdf file: broadcasting ones
-            ht.MPI_WORLD.Barrier()
-            zeros = ht.zeros((1, 1, 1, 1), device=self.device)
-            zeros.save(self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE, mode="w")
-            ones = ht.ones((1, 1), device=self.device)
-            ones.save(self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE, mode="r+")
-            if split_range.comm.rank == 0:
-                with ht.io.nc.Dataset(self.NETCDF_OUT_PATH, "r") as handle:
-                    comparison = torch.tensor(
-                        handle[self.NETCDF_VARIABLE][indices],
-                        dtype=torch.int32,
-                        device=self.device.torch_device,
-                    )
-                self.assertTrue((ones.larray == comparison).all())
-
-            # different split and dtype
-            ht.MPI_WORLD.Barrier()
-            zeros = ht.zeros((2, 2), split=1, dtype=ht.int32, device=self.device)
-            zeros_nosplit = ht.zeros((2, 2), dtype=ht.int32, device=self.device)
-            zeros.save(self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE, mode="w")
-            if split_range.comm.rank == 0:
-                with ht.io.nc.Dataset(self.NETCDF_OUT_PATH, "r") as handle:
-                    comparison = torch.tensor(
-                        handle[self.NETCDF_VARIABLE][:],
-                        dtype=torch.int32,
-                        device=self.device.torch_device,
-                    )
-                self.assertTrue((zeros_nosplit.larray == comparison).all())
+        # batch the local and the split range into one file under separate
+        # dataset names, so a single readback at the end verifies both
+        local_range = self.ARANGE100
+        split_range = self.ARANGE100_SPLIT0
+        local_range.save(self.HDF5_OUT_PATH, "local", dtype=local_range.dtype.char())
+        split_range.save(self.HDF5_OUT_PATH, "split", mode="a", dtype=split_range.dtype.char())
+        self._verify_hdf5_many_rank0((("local", local_range.larray), ("split", local_range.larray)))
+
+    def test_save_netcdf_basic(self):
+        # netcdf support is optional
+        if not self.NETCDF_AVAILABLE:
+            self.skipTest("Requires NetCDF")
+
+        # local range, creating the file with the default write mode
+        local_range = self.ARANGE100
+        local_range.save(self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE)
+        self._verify_netcdf_rank0(local_range.larray)
+
+        # split range; reuse the file and variable just created instead of
+        # truncating and re-defining them for a same-shaped write
+        split_range = self.ARANGE100_SPLIT0
+        split_range.save(self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE, mode="r+")
+        self._verify_netcdf_rank0(local_range.larray)
+
+    def test_save_netcdf_dimension_names(self):
+        # netcdf support is optional
+        if not self.NETCDF_AVAILABLE:
+            self.skipTest("Requires NetCDF")
+
+        # naming dimensions: string
+        local_range = self.ARANGE100
+        local_range.save(
+            self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE, dimension_names=self.NETCDF_DIMENSION
+        )
+        self._verify_netcdf_dims_rank0(local_range.larray, self.NETCDF_DIMENSION)
+
+        # naming dimensions: tuple
+        local_range.save(
+            self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE, dimension_names=(self.NETCDF_DIMENSION,)
+        )
+        self._verify_netcdf_dims_rank0(local_range.larray, self.NETCDF_DIMENSION)
+
+    def test_save_netcdf_unlimited(self):
+        # netcdf support is optional
+        if not self.NETCDF_AVAILABLE:
+            self.skipTest("Requires NetCDF")
+
+        # appending unlimited variable
+        local_range = self.ARANGE100
+        split_range = self.ARANGE100_SPLIT0
+        split_range.save(self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE, is_unlimited=True)
+        ht.MPI_WORLD.Barrier()
+        split_range.save(
+            self.NETCDF_OUT_PATH,
+            self.NETCDF_VARIABLE,
+            mode="r+",
+            file_slices=slice(split_range.size, None, None),
+            # debug=True,
+        )
+        self._verify_netcdf_rank0(_double_arange(100, self.device.torch_device))
+
+    def test_save_netcdf_indexing(self):
+        # netcdf support is optional
+        if not self.NETCDF_AVAILABLE:
+            self.skipTest("Requires NetCDF")
+
+        # indexing netcdf file: single index
+        zeros = ht.zeros((20, 1, 20, 2), device=self.device)
+        zeros.save(self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE, mode="w")
+        ones = self.ONES20
+        indices = (-1, 0, slice(None), 1)
+        ones.save(self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE, mode="r+", file_slices=indices)
+        self._verify_netcdf_rank0(ones.larray, indices)
+
+        # indexing netcdf file: multiple indices
+        ht.MPI_WORLD.Barrier()
+        small_range_split = self.ARANGE10_SPLIT0
+        small_range = self.ARANGE10
+        indices = [[0, 9, 5, 2, 1, 3, 7, 4, 8, 6]]
+        small_range_split.save(
+            self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE, mode="w", file_slices=indices
+        )
+        self._verify_netcdf_rank0(small_range.larray, indices)
+
+        # slicing netcdf file
+        sslice = slice(7, 2, -1)
+        range_five_split = self.ARANGE5_SPLIT0
+        range_five = self.ARANGE5
+        range_five_split.save(
+            self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE, mode="r+", file_slices=sslice
+        )
+        self._verify_netcdf_rank0(range_five.larray, sslice)
+
+    def test_save_netcdf_broadcasting(self):
+        # netcdf support is optional
+        if not self.NETCDF_AVAILABLE:
+            self.skipTest("Requires NetCDF")
+
+        # indexing netcdf file: broadcasting array
+        zeros = ht.zeros((2, 1, 1, 4), device=self.device)
+        zeros.save(self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE, mode="w")
+        ones = ht.ones((4), split=0, device=self.device)
+        indices = (0, slice(None), slice(None))
+        ones.save(self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE, mode="r+", file_slices=indices)
+        self._verify_netcdf_rank0(_full_ref((4,), 1, self.device.torch_device), indices)
+
+        # indexing netcdf file: broadcasting var
+        ht.MPI_WORLD.Barrier()
+        zeros = ht.zeros((2, 2), device=self.device)
+        zeros.save(self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE, mode="w")
+        ones = ht.ones((1, 2, 1), split=0, device=self.device)
+        indices = (0,)
+        ones.save(self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE, mode="r+", file_slices=indices)
+        self._verify_netcdf_rank0(_full_ref((1, 2, 1), 1, self.device.torch_device), indices)
+
+        # indexing netcdf file: broadcasting ones
+        ht.MPI_WORLD.Barrier()
+        zeros = ht.zeros((1, 1, 1, 1), device=self.device)
+        zeros.save(self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE, mode="w")
+        ones = ht.ones((1, 1), device=self.device)
+        ones.save(self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE, mode="r+")
+        self._verify_netcdf_rank0(_full_ref((1, 1), 1, self.device.torch_device), indices)
+
+    def test_save_netcdf_split_dtype(self):
+        # netcdf support is optional
+        if not self.NETCDF_AVAILABLE:
+            self.skipTest("Requires NetCDF")
+
+        # different split and dtype
+        zeros = ht.zeros((2, 2), split=1, dtype=ht.int32, device=self.device)
+        zeros.save(self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE, mode="w")
+        self._verify_netcdf_rank0(_full_ref((2, 2), 0, self.device.torch_device))
 
     def test_save_exception(self):
         data = ht.arange(1)
 
-        if ht.io.supports_hdf5():
+        if self.HDF5_AVAILABLE:
             with self.assertRaises(TypeError):
                 ht.save(1, self.HDF5_OUT_PATH, self.HDF5_DATASET)
             with self.assertRaises(TypeError):
@@ -381,7 +552,7 @@ class TestIO(TestCase):
             with self.assertRaises(RuntimeError):
                 ht.save(data, self.HDF5_OUT_PATH, self.HDF5_DATASET)
 
-        if ht.io.supports_netcdf():
+        if self.NETCDF_AVAILABLE:
             with self.assertRaises(TypeError):
                 ht.save(1, self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE)
             with self.assertRaises(TypeError):
@@ -417,7 +588,7 @@ class TestIO(TestCase):
 
     def test_load_hdf5(self):
         # HDF5 support is optional
-        if not ht.io.supports_hdf5():
+        if not self.HDF5_AVAILABLE:
             self.skipTest("Requires HDF5")
 
         # default parameters
@@ -426,7 +597,7 @@ class TestIO(TestCase):
         self.assertEqual(iris.shape, self.IRIS.shape)
         self.assertEqual(iris.dtype, ht.float32)
         self.assertEqual(iris.larray.dtype, torch.float32)
-        self.assertTrue((self.IRIS == iris.larray).all())
+        self.assertTrue(torch.equal(self._iris_like(iris.larray), iris.larray))
 
         # positive split axis
         iris = ht.load_hdf5(self.HDF5_PATH, self.HDF5_DATASET, split=0)
@@ -455,7 +626,7 @@ class TestIO(TestCase):
 
     def test_load_hdf5_exception(self):
         # HDF5 support is optional
-        if not ht.io.supports_hdf5():
+        if not self.HDF5_AVAILABLE:
             self.skipTest("Requires HDF5")
 
         # improper argument types
@@ -474,36 +645,32 @@ class TestIO(TestCase):
 
     def test_save_hdf5(self):
         # HDF5 support is optional
-        if not ht.io.supports_hdf5():
+        if not self.HDF5_AVAILABLE:
             return
 
         # local unsplit data
-        local_data = ht.arange(100)
+        local_data = self.ARANGE100
         ht.save_hdf5(
             local_data, self.HDF5_OUT_PATH, self.HDF5_DATASET, dtype=local_data.dtype.char()
         )
         if local_data.comm.rank == 0:
             with ht.io.h5py.File(self.HDF5_OUT_PATH, "r") as handle:
-                comparison = torch.tensor(
-                    handle[self.HDF5_DATASET], dtype=torch.int32, device=self.device.torch_device
-                )
-            self.assertTrue((local_data.larray == comparison).all())
+                comparison = self._read_as_int32(handle[self.HDF5_DATASET])
+            self._assert_tensors_equal(local_data.larray, comparison)
 
         # distributed data range
-        split_data = ht.arange(100, split=0)
+        split_data = self.ARANGE100_SPLIT0
         ht.save_hdf5(
             split_data, self.HDF5_OUT_PATH, self.HDF5_DATASET, dtype=split_data.dtype.char()
         )
         if split_data.comm.rank == 0:
             with ht.io.h5py.File(self.HDF5_OUT_PATH, "r") as handle:
-                comparison = torch.tensor(
-                    handle[self.HDF5_DATASET], dtype=torch.int32, device=self.device.torch_device
-                )
-            self.assertTrue((local_data.larray == comparison).all())
+                comparison = self._read_as_int32(handle[self.HDF5_DATASET])
+            self._assert_tensors_equal(local_data.larray, comparison)
 
     def test_save_hdf5_exception(self):
         # HDF5 support is optional
-        if not ht.io.supports_hdf5():
+        if not self.HDF5_AVAILABLE:
             self.skipTest("Requires HDF5")
 
         # dummy data
@@ -518,7 +685,7 @@ class TestIO(TestCase):
 
     def test_load_netcdf(self):
         # netcdf support is optional
-        if not ht.io.supports_netcdf():
+        if not self.NETCDF_AVAILABLE:
             self.skipTest("Requires NetCDF")
 
         # default parameters
@@ -527,7 +694,7 @@ class TestIO(TestCase):
         self.assertEqual(iris.shape, self.IRIS.shape)
         self.assertEqual(iris.dtype, ht.float32)
         self.assertEqual(iris.larray.dtype, torch.float32)
-        self.assertTrue((self.IRIS == iris.larray).all())
+        self.assertTrue(torch.equal(self._iris_like(iris.larray), iris.larray))
 
         # positive split axis
         iris = ht.load_netcdf(self.NETCDF_PATH, self.NETCDF_VARIABLE, split=0)
@@ -556,7 +723,7 @@ class TestIO(TestCase):
 
     def test_load_netcdf_exception(self):
         # netcdf support is optional
-        if not ht.io.supports_netcdf():
+        if not self.NETCDF_AVAILABLE:
             self.skipTest("Requires NetCDF")
 
         # improper argument types
@@ -575,36 +742,28 @@ class TestIO(TestCase):
 
     def test_save_netcdf(self):
         # netcdf support is optional
-        if not ht.io.supports_netcdf():
+        if not self.NETCDF_AVAILABLE:
             self.skipTest("Requires NetCDF")
 
         # local unsplit data
-        local_data = ht.arange(100)
+        local_data = self.ARANGE100
         ht.save_netcdf(local_data, self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE)
         if local_data.comm.rank == 0:
             with ht.io.nc.Dataset(self.NETCDF_OUT_PATH, "r") as handle:
-                comparison = torch.tensor(
-                    handle[self.NETCDF_VARIABLE][:],
-                    dtype=torch.int32,
-                    device=self.device.torch_device,
-                )
-            self.assertTrue((local_data.larray == comparison).all())
+                comparison = self._read_as_int32(handle[self.NETCDF_VARIABLE][:])
+            self._assert_tensors_equal(local_data.larray, comparison)
 
         # distributed data range
-        split_data = ht.arange(100, split=0)
+        split_data = self.ARANGE100_SPLIT0
         ht.save_netcdf(split_data, self.NETCDF_OUT_PATH, self.NETCDF_VARIABLE)
         if split_data.comm.rank == 0:
             with ht.io.nc.Dataset(self.NETCDF_OUT_PATH, "r") as handle:
-                comparison = torch.tensor(
-                    handle[self.NETCDF_VARIABLE][:],
-                    dtype=torch.int32,
-                    device=self.device.torch_device,
-                )
-            self.assertTrue((local_data.larray == comparison).all())
+                comparison = self._read_as_int32(handle[self.NETCDF_VARIABLE][:])
+            self._assert_tensors_equal(local_data.larray, comparison)
 
     def test_save_netcdf_exception(self):
         # netcdf support is optional
-        if not ht.io.supports_netcdf():
+        if not self.NETCDF_AVAILABLE:
             self.skipTest("Requires NetCDF")
 
         # dummy data
@@ -3,10 +3,11 @@ Tool for using a dataset which will not fit in memory with neural networks
 """
 
 import math
+import numpy as np
+import os
 import queue
 import threading
 import torch
-import time
 
 from torch.utils import data as torch_data
 from typing import Callable, List, Iterator, Union
@@ -17,16 +18,64 @@ from ...core.communication import MPI_WORLD
 __all__ = ["PartialH5Dataset", "PartialH5DataLoaderIter"]
 
 
-def queue_thread(q: queue.Queue):
-    while True:
-        items = q.get()
-        if isinstance(items, tuple):
-            func = items[0]
-            args = items[1:]
-            func(*args)
-        else:
-            items()
-        q.task_done()
+def _pin_to_core(slot: int):
+    """
+    Pin the calling thread to one core of the process' affinity set, counted from the
+    end of the set. Silently does nothing on platforms without ``sched_setaffinity``
+    or when fewer than three cores are available, so the main thread is never starved.
+    """
+    if not hasattr(os, "sched_setaffinity"):
+        return
+    try:
+        cores = sorted(os.sched_getaffinity(0))
+        if len(cores) > 2:
+            os.sched_setaffinity(0, {cores[slot % len(cores)]})
+    except OSError:
+        pass
+
+
+def _identity(x):
+    """
+    No-op transform used to pad the per-field transform list.
+    """
+    return x
+
+
+def _record_stream(data, stream):
+    """
+    Mark every CUDA tensor in ``data`` as in use by ``stream``, recursing through lists,
+    tuples and dicts. Needed when tensors allocated on one stream are consumed and released on
+    another: without the mark, the caching allocator may recycle their storage into later work
+    on the allocating stream while the consuming stream still reads it.
+    """
+    if isinstance(data, torch.Tensor):
+        if data.is_cuda:
+            data.record_stream(stream)
+    elif isinstance(data, (list, tuple)):
+        for d in data:
+            _record_stream(d, stream)
+    elif isinstance(data, dict):
+        for d in data.values():
+            _record_stream(d, stream)
+
+
+def _pin_memory(data):
+    """
+    Pin the host memory of all CPU tensors in ``data``, recursing through lists, tuples and
+    dicts. Tensors that are already pinned or do not live in pageable host memory pass
+    through untouched instead of being copied.
+    """
+    if isinstance(data, torch.Tensor):
+        if data.device.type == "cpu" and not data.is_pinned():
+            return data.pin_memory()
+        return data
+    if isinstance(data, tuple):
+        return tuple(_pin_memory(d) for d in data)
+    if isinstance(data, list):
+        return [_pin_memory(d) for d in data]
+    if isinstance(data, dict):
+        return {k: _pin_memory(v) for k, v in data.items()}
+    return data
 
 
 class PartialH5Dataset(torch_data.Dataset):
@@ -40,9 +89,11 @@ class PartialH5Dataset(torch_data.Dataset):
 
     Notes
     -----
-    H5 datasets require the GIL to load data. This can be a bottleneck if data needs to be loaded multiple times (e.g.
-    the case for using this dataset). It is recommended to find another way to preprocess the data and avoid using
-    H5 files for this reason.
+    Slab reads go through :func:`h5py.Dataset.read_direct` on dataset handles that are held open for the
+    lifetime of this object. h5py releases the GIL for the duration of the underlying ``H5Dread``, so only
+    the thin Python shim around each read serializes with the conversion thread; the bulk of the I/O
+    overlaps batch preparation and training. Keeping the handles cached here is also what keeps that
+    nogil path available, as reopening the file per read would re-enter the h5py Python layer each time.
 
     Parameters
     ----------
@@ -70,6 +121,28 @@ class PartialH5Dataset(torch_data.Dataset):
         How many elements to load from the file in the 0th dimension. Default is 7000 elements
     load_length : int, optional
         How many elements to load from the file in the iterator. Default is 1000 elements
+    dtype : torch.dtype, optional
+        If given, keep the resident data in this (typically reduced-precision) dtype so a larger
+        window fits in memory; reads are converted on the fly. Half-precision slabs
+        (``torch.float16`` / ``torch.bfloat16``) are upcast to ``torch.float32`` again after a
+        batch reaches its target device. Default is ``None``, i.e. the dtype stored in the file.
+    gpu_transforms : List[Callable], optional
+        Transforms to run on the whole batch after it has been moved to its target device, laid
+        out per field like ``transforms``. On GPU runs they execute batched on the copy stream,
+        so elementwise work such as normalization costs a fraction of its per-sample CPU price;
+        without a GPU they run in the conversion thread after the CPU transforms. Default is
+        ``None``.
+    pin_workers : bool, optional
+        Pin the background loading and conversion threads each to one core of this process'
+        affinity set (Linux only), keeping them from migrating across the cores the training
+        loop computes on. Leave disabled when several ranks share overlapping affinity masks.
+        Default is ``False``.
+    batched_transforms : bool, optional
+        Apply ``transforms`` to whole batches instead of sample by sample. Only enable this when
+        every transform broadcasts over the leading batch dimension and draws any randomness per
+        sample: per-sample random transforms accept batched input without complaint but would
+        then share a single random draw across the batch. A transform that rejects batched input
+        falls back to per-sample application after one probe. Default is ``False``.
     """
 
     def __init__(
@@ -82,6 +155,10 @@ class PartialH5Dataset(torch_data.Dataset):
         validate_set: bool = False,
         initial_load: int = 7000,
         load_length: int = 1000,
+        dtype: torch.dtype = None,
+        gpu_transforms: List[Callable] = None,
+        pin_workers: bool = False,
+        batched_transforms: bool = False,
     ):  # noqa: D107
         import h5py
 
@@ -89,7 +166,15 @@ class PartialH5Dataset(torch_data.Dataset):
         self.ishuffle = False
         self.file = file
         self.comm = comm
+        self.slab_dtype = dtype
+        self.pin_workers = pin_workers
+        self.batched_transforms = batched_transforms
+        # half-precision slabs are widened again once a batch reaches its device
+        self._upcast = torch.float32 if dtype in (torch.float16, torch.bfloat16) else None
         self.transforms = transforms if isinstance(transforms, (list, tuple)) else [transforms]
+        self.gpu_transforms = (
+            gpu_transforms if isinstance(gpu_transforms, (list, tuple)) else [gpu_transforms]
+        )
         self.gpu = True if torch.cuda.device_count() > 0 and use_gpu else False
         self.torch_device = "cpu"
         if torch.cuda.is_available() and use_gpu:
@@ -97,7 +182,10 @@ class PartialH5Dataset(torch_data.Dataset):
             self.torch_device = torch.device("cuda:" + str(dev_id))
             torch.cuda.set_device(dev_id)
 
-        f = h5py.File(file, "r")
+        # one read-only handle lives for the lifetime of the dataset; a generous chunk
+        # cache keeps partially read HDF5 chunks resident across the sliding-window reads
+        f = h5py.File(file, "r", rdcc_nbytes=256 * 1024 * 1024, rdcc_nslots=1000003)
+        self._h5file = f
         # too much data for the process
         fkeys = list(f.keys())
 
@@ -138,21 +226,81 @@ class PartialH5Dataset(torch_data.Dataset):
             dataset_names = [dataset_names]
         self.dataset_names = dataset_names
         self.dataset_order = []
+        # preallocate one buffer per dataset and read straight into it with read_direct,
+        # avoiding the intermediate array h5py's slicing path would allocate; pinned
+        # memory (GPU case) additionally makes the later device copies asynchronous
+        self._row_shapes = {}
+        self._torch_dtypes = {}
+        self._hold_buffers = {}
+        self._hold_views = {}
+        self._hold_counts = {}
+        self._h5sets = {d: f[d] for d in dataset_names}
         for d in dataset_names:
-            hld = f[d][self.load_start : self.load_end]
-            self.__setattr__(d, hld)
+            dset = self._h5sets[d]
+            self._row_shapes[d] = tuple(dset.shape[1:])
+            try:
+                self._torch_dtypes[d] = torch.from_numpy(np.empty((0,), dtype=dset.dtype)).dtype
+            except TypeError:
+                # string/vlen datasets map to numpy dtypes torch cannot represent;
+                # keep those resident as plain numpy arrays via h5py's slicing path
+                # and skip the pinned-buffer machinery for them
+                self._torch_dtypes[d] = None
+                self.__setattr__(d, dset[self.load_start : self.load_end])
+                continue
+            buf = self._new_buffer(d, self.load_initial)
+            self._read_slab(d, self.load_start, self.load_end, buf.numpy())
+            if dtype is not None and buf.dtype != dtype:
+                # keep the resident block in the reduced dtype; the read target above
+                # stays in the file's dtype since HDF5 fills numpy-compatible buffers
+                reduced = torch.empty(buf.shape, dtype=dtype, pin_memory=self.gpu)
+                reduced.copy_(buf)
+                buf = reduced
+            self.__setattr__(d, buf)
         self.load_start = self.load_end
-        self.load_end += self.load_len
-        f.close()
         self.load_thread = None
         self.epoch_end = False
-        # need the number of loads required for an epoch
-        self.loading_queue = queue.Queue()
-        self.loading_condition = threading.Condition()
-        threading.Thread(target=queue_thread, args=[self.loading_queue], daemon=True).start()
-        self.convert_queue = queue.Queue()
-        threading.Thread(target=queue_thread, args=[self.convert_queue], daemon=True).start()
-        self.used_indices = []
+        # released by the convert thread once load_len indices were consumed; unlike a
+        # bare condition variable, a semaphore remembers a release that happens before
+        # the loader gets around to waiting
+        self.load_signal = threading.Semaphore(0)
+        # dedicated loader thread: woken once per epoch by the iterator instead of
+        # dispatching bound methods through a generic queue consumer
+        self._epoch_signal = threading.Semaphore(0)
+        threading.Thread(target=self._load_loop, daemon=True).start()
+        # consumed indices live in a preallocated index buffer with a fill counter;
+        # the refill scatters fresh rows onto exactly those positions
+        self._used_idx = torch.empty(
+            self.load_initial + 2 * self.load_len if self.partial_dataset else 0, dtype=torch.long
+        )
+        self._used_count = 0
+
+    def __del__(self):
+        """
+        Close the file handle held open for the lifetime of the dataset.
+        """
+        try:
+            self._h5file.close()
+        except Exception:
+            pass
+
+    def _load_loop(self):
+        """
+        Body of the background loading thread: sleep until an iterator announces a new
+        epoch, then replace consumed rows until the epoch's loads are exhausted.
+        """
+        if self.pin_workers:
+            _pin_to_core(-1)
+        while True:
+            self._epoch_signal.acquire()
+            self.thread_replace_converted_batches()
+
+    def _new_buffer(self, d: str, rows: int) -> torch.Tensor:
+        """
+        Allocate a reusable row buffer for dataset ``d``; pinned when a GPU is in use.
+        """
+        return torch.empty(
+            (rows,) + self._row_shapes[d], dtype=self._torch_dtypes[d], pin_memory=self.gpu
+        )
 
     def Shuffle(self):
         """
@@ -187,38 +335,82 @@ class PartialH5Dataset(torch_data.Dataset):
 
     def thread_replace_converted_batches(self):
         """
-        Replace the elements of the dataset with newly loaded elements. :func:'PartialH5DataLoaderIter' will
-        put the used indices in the ``used_indices`` parameter. This object is reset to an empty list after
-        these elements are overwritten with new data.
+        Replace the elements of the dataset with newly loaded elements. :func:'PartialH5DataLoaderIter'
+        records the consumed indices in the ``_used_idx`` buffer; its fill counter is reset to zero after
+        those elements are overwritten with new data.
         """
-        import h5py
-
         self.loads_left = self.loads_needed
         ll = self.loads_left
+        for d in self.dataset_names:
+            if self._torch_dtypes[d] is None:
+                continue
+            # the iterator may round load_len up to a batch multiple, so the hold
+            # buffers are sized (or resized) here rather than in __init__
+            if d not in self._hold_buffers or self._hold_buffers[d].shape[0] < self.load_len:
+                hold = self._new_buffer(d, self.load_len)
+                self._hold_buffers[d] = hold
+                self._hold_views[d] = hold.numpy()
         for _ in range(ll):
-            with h5py.File(self.file, "r") as f:
-                for d in self.dataset_names:
-                    hld = f[d][self.load_start : self.load_end]
-                    self.__setattr__("hold" + d, hld)
-            if self.load_end + self.comm.size > self.total_size:
-                self.load_end = 0
-            self.load_start = self.load_end
-            self.load_end += self.load_len
-
-            # wait for lock1 *from* convert thread
-            with self.loading_condition:
-                self.loading_condition.wait()
-                for d in self.dataset_names:
-                    new = self.__getattribute__("hold" + d)
-                    dset = self.__getattribute__(d)
-                    new_top = new[: len(self.used_indices)]
-                    lnew = len(new_top)
-                    dset[self.used_indices[:lnew]] = new_top
-                    self.__setattr__(d, dset)
-                    self.__setattr__("hold" + d, new[lnew:])
-                # give up lock / notify convert thread
-                self.used_indices = []
-            self.loads_left -= 1
+            start, stop = self._next_load_range()
+            count = stop - start
+            for d in self.dataset_names:
+                if count > 0:
+                    if self._torch_dtypes[d] is None:
+                        # numpy-resident datasets cannot use read_direct into the
+                        # preallocated hold buffer; fall back to h5py slicing
+                        self._hold_buffers[d] = self._h5sets[d][start:stop]
+                    else:
+                        self._read_slab(d, start, stop, self._hold_views[d])
+                self._hold_counts[d] = count
+            self._refill_used_rows()
+
+    def _read_slab(self, d: str, start: int, stop: int, out: np.ndarray):
+        """
+        Fill ``out[: stop - start]`` with rows ``[start, stop)`` of dataset ``d``. Every file
+        read passes through this seam, so a subclass can swap in an alternative reader backend
+        (e.g. one that decodes chunks in parallel) by overriding this single method.
+        """
+        self._h5sets[d].read_direct(
+            out, source_sel=np.s_[start:stop], dest_sel=np.s_[0 : stop - start]
+        )
+
+    def _next_load_range(self):
+        """
+        Return the next ``(start, stop)`` slab window, advancing and wrapping within this
+        process' share of the file.
+        """
+        start = self.load_start
+        if start >= self.local_data_end:
+            start = self.local_data_start
+        stop = min(start + self.load_len, self.local_data_end)
+        self.load_start = self.local_data_start if stop >= self.local_data_end else stop
+        return start, stop
+
+    def _refill_used_rows(self):
+        """
+        Once the convert thread signals that enough indices have been consumed, overwrite
+        those rows of the local data with the held slab.
+        """
+        # wait for the signal *from* the convert thread
+        self.load_signal.acquire()
+        count = self._used_count
+        used = self._used_idx[:count]
+        for d in self.dataset_names:
+            # scatter the freshly read rows over the consumed ones in place; the
+            # public per-dataset attribute keeps pointing at the same buffer
+            lnew = min(self._hold_counts[d], count)
+            if lnew > 0:
+                target = self.__getattribute__(d)
+                new = self._hold_buffers[d][:lnew]
+                if isinstance(target, torch.Tensor):
+                    if new.dtype != target.dtype:
+                        new = new.to(target.dtype)
+                    target.index_copy_(0, used[:lnew], new)
+                else:
+                    # numpy-resident (e.g. string) datasets are scattered with fancy indexing
+                    target[used[:lnew].numpy()] = new
+        self._used_count = 0
+        self.loads_left -= 1
 
 
 class PartialH5DataLoaderIter(object):
@@ -245,27 +437,58 @@ class PartialH5DataLoaderIter(object):
         self._num_yielded = 0
         self.batch_size = loader.DataLoader.batch_size
         self.comm = self.dataset.comm
-        rand_samp_list = torch.randperm(self.dataset.load_initial).tolist()
 
         # todo: support other samplers: for now its only random
         if self.dataset.partial_dataset:
-            self.ready_batches = []
+            # bounded queue: the convert thread blocks on put() once enough batches are
+            # prepared, instead of running arbitrarily far ahead of the training loop
+            self.ready_batches = queue.Queue(maxsize=4)
+            # dedicated stream so host-to-device copies overlap the training stream;
+            # the consumer orders itself after the copy through the recorded event
+            self._copy_stream = torch.cuda.Stream() if self.dataset.gpu else None
+            # rings of preallocated batch buffers (pinned host staging plus device
+            # targets), sized lazily from the first batch so the field shapes do not
+            # have to be known up front
+            self._gpu_ring = None
+            self._cpu_ring = None
+            self._ring_events = None
+            self._ring_pos = 0
+            # recorded on the compute stream at every dequeue; the producer orders
+            # slot rewrites after it so consumer reads can never be overwritten
+            self._consumer_event = None
             mod_batch = self.dataset.load_len % self.batch_size
             if mod_batch != 0:
                 self.dataset.load_len += self.batch_size - mod_batch
-                self.dataset.load_end = self.dataset.load_start + self.dataset.load_len
-            # generate all indices
-            index_list = []
+            # probe the item structure once: __getitem__ must return the same
+            # single-tensor or tuple structure for every index, so the per-batch
+            # isinstance and None checks can be resolved here
+            probe = self.dataset[0]
+            self._n_fields = len(probe) if isinstance(probe, tuple) else 1
+            transforms = list(self.dataset.transforms[: self._n_fields])
+            transforms += [None] * (self._n_fields - len(transforms))
+            self._field_transforms = [t if t is not None else _identity for t in transforms]
+            gpu_transforms = list(self.dataset.gpu_transforms[: self._n_fields])
+            gpu_transforms += [None] * (self._n_fields - len(gpu_transforms))
+            self._field_gpu_transforms = [
+                t if t is not None else _identity for t in gpu_transforms
+            ]
+            # generate all indices for the epoch as one flat ndarray; boxing every
+            # index into a Python int via tolist() only to re-tensorize batch slices
+            # later is wasted work on large datasets
+            rng = np.random.RandomState(self._base_seed % (2 ** 32))
             idx_repeats = math.ceil(self.dataset.lcl_full_sz / self.dataset.load_initial)
-            for _ in range(idx_repeats):
-                index_list.extend(torch.randperm(self.dataset.load_initial).tolist())
-            # start the conversion
-            self.dataset.convert_queue.put((self.__thread_convert_all, index_list))
+            index_list = np.concatenate(
+                [rng.permutation(self.dataset.load_initial) for _ in range(idx_repeats)]
+            )
+            # start the conversion on a thread dedicated to this iterator
+            threading.Thread(
+                target=self.__thread_convert_all, args=(index_list,), daemon=True
+            ).start()
 
             self.length = len(index_list) // self.batch_size
-            self.dataset.loading_queue.put(self.dataset.thread_replace_converted_batches)
+            self.dataset._epoch_signal.release()
         else:
-            self.rand_samp_list = rand_samp_list
+            self.rand_samp_list = torch.randperm(self.dataset.load_initial).tolist()
             self.length = len(self._index_sampler)
 
         self._dataset_fetcher = torch_data.dataloader._DatasetKind.create_fetcher(
@@ -288,16 +511,26 @@ class PartialH5DataLoaderIter(object):
             index = next(self._sampler_iter)  # may raise StopIteration
             data = self._dataset_fetcher.fetch(index)  # may raise StopIteration
             if self._pin_memory:
-                data = torch_data._utils.pin_memory.pin_memory(data)
+                data = _pin_memory(data)
             return data
         if self._num_yielded == self.__len__():
             raise StopIteration
-        while len(self.ready_batches) < 1:
-            time.sleep(0.1)
-        batch = self.ready_batches.pop(0)
-        for b in range(len(batch)):
-            if batch[b].device != self.dataset.torch_device:
-                batch[b] = batch[b].to(self.dataset.torch_device)
+        batch, event = self.ready_batches.get()
+        if event is not None:
+            # the device copy was issued on the side stream; make the compute stream
+            # wait for it instead of synchronizing the host
+            stream = torch.cuda.current_stream()
+            event.wait(stream)
+            # tensors allocated on the copy stream (upcast results and anything the
+            # gpu_transforms returned, in whatever structure they returned it) are
+            # released by this consumer; mark them so their storage is not recycled early
+            _record_stream(batch, stream)
+            # by the time the next dequeue records this event, all compute-stream
+            # work on the previous batch has been enqueued; the producer waits on
+            # the latest one before rewriting a ring slot
+            done = torch.cuda.Event()
+            done.record(stream)
+            self._consumer_event = done
         return batch
 
     def __next__(self):
@@ -322,38 +555,116 @@ class PartialH5DataLoaderIter(object):
         return self
 
     def __thread_convert_all(self, index_list):
-        # convert all of the elements, collate them into batches, and send the batches to the correct device
-        # this function als communicates with the data loading thread from the PartialH5Dataset to notify it
-        # when it has the correct amount of data to write.
-        converted_items = []
-        for ind in index_list:
-            # get the desired image/target/... to begin composing a batch
-            single_item = self.dataset[ind]
-            if not isinstance(single_item, tuple) and self.dataset.transforms[0] is not None:
-                single_item = self.dataset.transforms[0](single_item)
-            if isinstance(single_item, tuple):
-                single_item = list(single_item)
-                for ii in range(len(single_item)):
-                    # do transforms (have all torch stuff here)
-                    if self.dataset.transforms[ii] is not None:
-                        single_item[ii] = self.dataset.transforms[ii](single_item[ii])
-            converted_items.append(single_item)
-            self.dataset.used_indices.append(ind)
-            if len(converted_items) == self.batch_size:
-                if (
-                    len(self.dataset.used_indices) == self.dataset.load_len
-                    and self.dataset.loads_left > 0
-                ):
-                    with self.dataset.loading_condition:
-                        self.dataset.loading_condition.notify()
-                batch = self._collate_fn(converted_items)
+        # compose whole batches with a single fancy-index call into the resident data
+        # instead of gathering them item by item; this function also communicates with
+        # the data loading thread from the PartialH5Dataset to notify it when it has
+        # the correct amount of data to write.
+        # stable lookups are hoisted to locals for the duration of the epoch;
+        # used_indices and loads_left must be read through the dataset each time
+        # because the loader thread rebinds them
+        bs = self.batch_size
+        dataset = self.dataset
+        if dataset.pin_workers:
+            _pin_to_core(-2)
+        transforms = self._field_transforms
+        multi = self._n_fields > 1
+        device = dataset.torch_device
+        copy_stream = self._copy_stream
+        ready_queue = self.ready_batches
+        put_batch = ready_queue.put
+        as_tensor = torch.as_tensor
+        upcast = dataset._upcast
+        gpu_transforms = self._field_gpu_transforms
+        run_gpu_transforms = any(t is not _identity for t in gpu_transforms)
+        used_idx = dataset._used_idx
+        used_capacity = used_idx.shape[0]
+        collate = self._collate_fn
+        # whole-batch fancy indexing needs __getitem__ to accept an index tensor;
+        # overrides with strict single-index semantics are detected on the first
+        # batch and fetched item by item through the collate function instead
+        batched_getitem = True
+        # per-sample application is the default: per-sample random transforms accept
+        # batched input without raising but would then share one draw across the
+        # batch; batched application is opt-in and probed once per transform
+        batched_fields = set(range(len(transforms))) if dataset.batched_transforms else set()
+        for start in range(0, len(index_list) - len(index_list) % bs, bs):
+            batch_indices = as_tensor(index_list[start : start + bs])
+            if batched_getitem:
                 try:
-                    for bb in range(2):
-                        bb_batch = self.ready_batches[bb]
-                        for b in range(len(batch)):
-                            bb_batch[b] = bb_batch[b].to(self.dataset.torch_device)
-                        self.ready_batches[bb] = bb_batch
-                except IndexError:
-                    pass
-                self.ready_batches.append(batch)
-                converted_items = []
+                    fetched = dataset[batch_indices]
+                except (TypeError, ValueError, IndexError, RuntimeError):
+                    batched_getitem = False
+            if not batched_getitem:
+                fetched = collate([dataset[int(ind)] for ind in batch_indices])
+                if multi:
+                    fetched = tuple(fetched)
+            fields = list(fetched) if multi else [fetched]
+            for ii, transform in enumerate(transforms):
+                if transform is _identity:
+                    continue
+                if ii in batched_fields:
+                    try:
+                        fields[ii] = transform(fields[ii])
+                        continue
+                    except (TypeError, ValueError, RuntimeError):
+                        # this transform cannot digest a batched tensor; remember that
+                        # and apply it per sample from here on
+                        batched_fields.discard(ii)
+                fields[ii] = torch.stack([transform(item) for item in fields[ii]])
+            batch = fields if multi else fields[0]
+            cnt = dataset._used_count
+            end = min(cnt + bs, used_capacity)
+            if end > cnt:
+                used_idx[cnt:end] = batch_indices[: end - cnt]
+            dataset._used_count = end
+            if end == dataset.load_len and dataset.loads_left > 0:
+                dataset.load_signal.release()
+            event = None
+            if copy_stream is not None:
+                fields_cpu = batch if multi else [batch]
+                if self._gpu_ring is None:
+                    # the rings must outnumber the queue capacity so a slot is never
+                    # rewritten while its batch is still queued or being consumed
+                    ring_size = ready_queue.maxsize + 2
+                    self._gpu_ring = [
+                        [torch.empty(f.shape, dtype=f.dtype, device=device) for f in fields_cpu]
+                        for _ in range(ring_size)
+                    ]
+                    self._cpu_ring = [
+                        [torch.empty(f.shape, dtype=f.dtype, pin_memory=True) for f in fields_cpu]
+                        for _ in range(ring_size)
+                    ]
+                    self._ring_events = [None] * ring_size
+                pos = self._ring_pos
+                self._ring_pos = (pos + 1) % len(self._gpu_ring)
+                # before rewriting the staging slot, make sure its previous copy landed
+                if self._ring_events[pos] is not None:
+                    self._ring_events[pos].synchronize()
+                slot = self._gpu_ring[pos]
+                stage = self._cpu_ring[pos]
+                for b, f in enumerate(fields_cpu):
+                    stage[b].copy_(f)
+                # a reused slot was handed to the consumer by value: order its rewrite
+                # on the copy stream after the consumer's enqueued compute-stream reads
+                consumer_done = self._consumer_event
+                if consumer_done is not None:
+                    copy_stream.wait_event(consumer_done)
+                with torch.cuda.stream(copy_stream):
+                    for b in range(len(stage)):
+                        slot[b].copy_(stage[b], non_blocking=True)
+                    # widen reduced-precision batches on the device, after the (cheap,
+                    # narrow) transfer rather than before it
+                    out = slot if upcast is None else [s.to(upcast) for s in slot]
+                    if run_gpu_transforms:
+                        out = [gpu_transforms[b](out[b]) for b in range(len(out))]
+                    event = torch.cuda.Event()
+                    event.record(copy_stream)
+                self._ring_events[pos] = event
+                batch = out if multi else out[0]
+            elif upcast is not None or run_gpu_transforms:
+                for ii in range(len(fields)):
+                    if upcast is not None:
+                        fields[ii] = fields[ii].to(upcast)
+                    fields[ii] = gpu_transforms[ii](fields[ii])
+                batch = fields if multi else fields[0]
+            put_batch((batch, event))